@@ -4,18 +4,41 @@ This script demonstrates anomaly detection capabilities using Time Series RAG
 and the analytics module.
 """
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; docs are built headless
 import matplotlib.pyplot as plt
 from timeseries_rag.models import TimeSeriesEmbedder
 from timeseries_rag.rag import TimeSeriesRAG, TimeSeriesDocument
 from timeseries_rag.analytics import TimeSeriesAnalytics
 
+def prepare_figure(fig, figsize):
+    """Return ``fig`` cleared and resized, or a new figure if it is None.
+    
+    Reusing one Figure across examples avoids re-initializing a renderer
+    for every plot.
+    """
+    if fig is None:
+        return plt.figure(figsize=figsize)
+    fig.clear()
+    fig.set_size_inches(*figsize)
+    return fig
+
+@functools.lru_cache(maxsize=1)
 def create_synthetic_sensor_data():
     """Create synthetic sensor data with anomalies.
     
+    The data is seeded and cached, so repeated calls return the same arrays
+    without regenerating them.
+    
     Returns:
         tuple: Three time series (temperature, vibration, pressure) with anomalies
     """
+    rng = np.random.default_rng(42)
+    
     # Time points
     t = np.linspace(0, 10, 1000)
     
@@ -24,22 +47,25 @@ def create_synthetic_sensor_data():
     temp_anomalies = np.zeros_like(t)
     temp_anomalies[300:320] = 10  # Sudden spike
     temp_anomalies[600:700] = 5   # Sustained deviation
-    temperature = temp_base + temp_anomalies + np.random.normal(0, 0.5, size=len(t))
+    temperature = temp_base + temp_anomalies + rng.normal(0, 0.5, size=len(t))
     
     # Vibration with intermittent spikes
-    vibration = np.random.normal(0, 0.1, size=len(t))
-    spike_locations = np.random.choice(len(t), size=10, replace=False)
-    vibration[spike_locations] += np.random.uniform(1, 2, size=len(spike_locations))
+    vibration = rng.normal(0, 0.1, size=len(t))
+    spike_locations = rng.choice(len(t), size=10, replace=False)
+    vibration[spike_locations] += rng.uniform(1, 2, size=len(spike_locations))
     
     # Pressure with gradual drift and sudden drop
-    pressure = 100 + 0.1 * t + np.random.normal(0, 0.1, size=len(t))
+    pressure = 100 + 0.1 * t + rng.normal(0, 0.1, size=len(t))
     pressure[800:] -= 5  # Sudden drop
     
     return temperature, vibration, pressure, t
 
-def detect_anomalies_example():
+def detect_anomalies_example(fig=None):
     """Example of detecting anomalies in sensor data.
     
+    Args:
+        fig: Optional Figure to draw into; it is cleared first
+    
     This example demonstrates:
     1. Creating synthetic sensor data with known anomalies
     2. Using TimeSeriesAnalytics to detect anomalies
@@ -48,51 +74,49 @@ def detect_anomalies_example():
     # Get synthetic data
     temperature, vibration, pressure, t = create_synthetic_sensor_data()
     
-    # Initialize analytics for each sensor
-    temp_analytics = TimeSeriesAnalytics(temperature)
-    vib_analytics = TimeSeriesAnalytics(vibration)
-    press_analytics = TimeSeriesAnalytics(pressure)
-    
-    # Detect anomalies
-    temp_anomalies = temp_analytics.detect_anomalies(window_size=50)
-    vib_anomalies = vib_analytics.detect_anomalies(window_size=20)
-    press_anomalies = press_analytics.detect_anomalies(window_size=100)
+    # Detect anomalies in each sensor concurrently; the Numba kernel
+    # releases the GIL, so the threads run in parallel
+    sensors = [(temperature, 50), (vibration, 20), (pressure, 100)]
+    with ThreadPoolExecutor(len(sensors)) as executor:
+        temp_anomalies, vib_anomalies, press_anomalies = executor.map(
+            lambda sensor: TimeSeriesAnalytics(sensor[0]).detect_anomalies(
+                window_size=sensor[1]
+            ),
+            sensors
+        )
     
     # Visualize results
-    plt.figure(figsize=(15, 10))
+    fig = prepare_figure(fig, (15, 10))
+    axes = fig.subplots(3, 1)
     
     # Temperature
-    plt.subplot(3, 1, 1)
-    plt.plot(t, temperature, label='Temperature')
+    axes[0].plot(t, temperature, label='Temperature')
     if temp_anomalies:
         anomaly_idx = [x[0] for x in temp_anomalies]
-        plt.scatter(t[anomaly_idx], temperature[anomaly_idx],
-                   color='red', label='Anomalies')
-    plt.title('Temperature Sensor')
-    plt.legend()
+        axes[0].scatter(t[anomaly_idx], temperature[anomaly_idx],
+                        color='red', label='Anomalies')
+    axes[0].set_title('Temperature Sensor')
+    axes[0].legend()
     
     # Vibration
-    plt.subplot(3, 1, 2)
-    plt.plot(t, vibration, label='Vibration')
+    axes[1].plot(t, vibration, label='Vibration')
     if vib_anomalies:
         anomaly_idx = [x[0] for x in vib_anomalies]
-        plt.scatter(t[anomaly_idx], vibration[anomaly_idx],
-                   color='red', label='Anomalies')
-    plt.title('Vibration Sensor')
-    plt.legend()
+        axes[1].scatter(t[anomaly_idx], vibration[anomaly_idx],
+                        color='red', label='Anomalies')
+    axes[1].set_title('Vibration Sensor')
+    axes[1].legend()
     
     # Pressure
-    plt.subplot(3, 1, 3)
-    plt.plot(t, pressure, label='Pressure')
+    axes[2].plot(t, pressure, label='Pressure')
     if press_anomalies:
         anomaly_idx = [x[0] for x in press_anomalies]
-        plt.scatter(t[anomaly_idx], pressure[anomaly_idx],
-                   color='red', label='Anomalies')
-    plt.title('Pressure Sensor')
-    plt.legend()
+        axes[2].scatter(t[anomaly_idx], pressure[anomaly_idx],
+                        color='red', label='Anomalies')
+    axes[2].set_title('Pressure Sensor')
+    axes[2].legend()
     
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
     
     return temp_anomalies, vib_anomalies, press_anomalies
 
@@ -105,47 +129,56 @@ def analyze_anomaly_patterns(anomalies, data, window_size=50):
         window_size: Size of window around anomalies to analyze
     
     Returns:
-        List of windows around anomalies
+        Array of shape (n_anomalies, window_size) with the window centred on
+        each anomaly; the series is edge-padded so every window is full length
     """
-    windows = []
-    for idx, _ in anomalies:
-        start = max(0, idx - window_size//2)
-        end = min(len(data), idx + window_size//2)
-        windows.append(data[start:end])
-    return windows
+    padded = np.pad(data, window_size//2, mode='edge')
+    idx = np.fromiter((a[0] for a in anomalies), dtype=np.int64,
+                      count=len(anomalies))
+    return np.lib.stride_tricks.sliding_window_view(padded, window_size)[idx]
 
-def anomaly_pattern_analysis_example():
+def anomaly_pattern_analysis_example(temp_anomalies, vib_anomalies,
+                                     press_anomalies, fig=None):
     """Example of analyzing patterns in anomalies.
     
+    Args:
+        temp_anomalies: Temperature anomalies from detect_anomalies_example()
+        vib_anomalies: Vibration anomalies from detect_anomalies_example()
+        press_anomalies: Pressure anomalies from detect_anomalies_example()
+        fig: Optional Figure to draw into; it is cleared first
+    
     This example demonstrates:
-    1. Detecting anomalies in multiple sensors
+    1. Reusing anomalies detected in multiple sensors
     2. Extracting patterns around anomalies
     3. Using RAG to find similar anomaly patterns
     """
-    # Get data and detect anomalies
+    # Get the (cached) sensor data the anomalies were detected in
     temperature, vibration, pressure, t = create_synthetic_sensor_data()
-    temp_anomalies, vib_anomalies, press_anomalies = detect_anomalies_example()
     
     # Initialize RAG system
     embedder = TimeSeriesEmbedder()
     rag = TimeSeriesRAG()
     
     # Extract and store anomaly patterns
+    docs = []
     for sensor_name, anomalies, data in [
         ('temperature', temp_anomalies, temperature),
         ('vibration', vib_anomalies, vibration),
         ('pressure', press_anomalies, pressure)
     ]:
         windows = analyze_anomaly_patterns(anomalies, data)
-        for i, window in enumerate(windows):
-            embedding = embedder.embed(window)
+        if len(windows) == 0:
+            continue
+        embeddings = embedder.embed_batch(windows)
+        for i, (window, embedding) in enumerate(zip(windows, embeddings)):
             doc = TimeSeriesDocument(
                 id=f'{sensor_name}_anomaly_{i}',
                 data=window,
                 metadata={'sensor': sensor_name, 'type': 'anomaly'},
                 embedding=embedding
             )
-            rag.add_document(doc)
+            docs.append(doc)
+    rag.add_documents(docs)
     
     # Find similar anomaly patterns
     if temp_anomalies:  # Use first temperature anomaly as query
@@ -156,29 +189,34 @@ def anomaly_pattern_analysis_example():
         results = rag.search(query_embedding, k=3)
         
         # Visualize similar anomalies
-        plt.figure(figsize=(12, 4))
+        fig = prepare_figure(fig, (12, 4))
+        axes = fig.subplots(1, 2)
         
-        plt.subplot(1, 2, 1)
-        plt.plot(query_window)
-        plt.title('Query Anomaly Pattern')
-        plt.xlabel('Time')
-        plt.ylabel('Value')
+        axes[0].plot(query_window)
+        axes[0].set_title('Query Anomaly Pattern')
+        axes[0].set_xlabel('Time')
+        axes[0].set_ylabel('Value')
         
-        plt.subplot(1, 2, 2)
         for result in results:
-            plt.plot(result['data'],
-                    label=f"{result['metadata']['sensor']}\n"
-                          f"Distance: {result['distance']:.2f}")
-        plt.title('Similar Anomaly Patterns')
-        plt.xlabel('Time')
-        plt.ylabel('Value')
-        plt.legend()
-        plt.tight_layout()
-        plt.show()
+            axes[1].plot(result['data'],
+                         label=f"{result['metadata']['sensor']}\n"
+                               f"Distance: {result['distance']:.2f}")
+        axes[1].set_title('Similar Anomaly Patterns')
+        axes[1].set_xlabel('Time')
+        axes[1].set_ylabel('Value')
+        axes[1].legend()
+        fig.tight_layout()
 
 if __name__ == "__main__":
-    print("Running anomaly detection example...")
-    detect_anomalies_example()
-    
-    print("\nRunning anomaly pattern analysis example...")
-    anomaly_pattern_analysis_example()
\ No newline at end of file
+    with plt.rc_context({'figure.max_open_warning': 0}):
+        fig = plt.figure()
+        
+        # The backend is non-interactive, so each plot is saved before the
+        # next example clears the Figure
+        print("Running anomaly detection example...")
+        anomalies = detect_anomalies_example(fig)
+        fig.savefig('anomaly_detection.png')
+        
+        print("\nRunning anomaly pattern analysis example...")
+        anomaly_pattern_analysis_example(*anomalies, fig=fig)
+        fig.savefig('anomaly_patterns.png')
\ No newline at end of file
@@ -5,20 +5,38 @@ Time Series RAG and the analytics module.
 """
 
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; docs are built headless
 import matplotlib.pyplot as plt
 from timeseries_rag.models import TimeSeriesEmbedder
 from timeseries_rag.rag import TimeSeriesRAG, TimeSeriesDocument
 from timeseries_rag.analytics import TimeSeriesAnalytics
 
-def extract_patterns_example():
+def prepare_figure(fig, figsize):
+    """Return ``fig`` cleared and resized, or a new figure if it is None.
+    
+    Reusing one Figure across examples avoids re-initializing a renderer
+    for every plot.
+    """
+    if fig is None:
+        return plt.figure(figsize=figsize)
+    fig.clear()
+    fig.set_size_inches(*figsize)
+    return fig
+
+def extract_patterns_example(fig=None):
     """Example of extracting and analyzing patterns.
     
+    Args:
+        fig: Optional Figure to draw into; it is cleared first
+    
     This example demonstrates:
     1. Creating synthetic time series data
     2. Using TimeSeriesAnalytics to extract patterns
     3. Visualizing the extracted patterns
     """
     # Create synthetic data with multiple patterns
+    rng = np.random.default_rng(42)
     t = np.linspace(0, 20, 1000)
     
     # Combine different patterns
@@ -26,33 +44,33 @@ def extract_patterns_example():
         np.sin(t) +                     # Base sine wave
         0.5 * np.sin(2 * t) +           # Higher frequency component
         0.2 * np.sin(0.5 * t) +         # Lower frequency component
-        0.1 * np.random.randn(len(t))   # Random noise
+        0.1 * rng.standard_normal(len(t))  # Random noise
     )
-
+    
     # Initialize analytics
     analytics = TimeSeriesAnalytics(data)
-
+    
     # Extract patterns
     patterns = analytics.extract_patterns(window_size=100, n_patterns=3)
-
+    
     # Visualize patterns
-    plt.figure(figsize=(15, 5))
-    for i, pattern in enumerate(patterns):
-        plt.subplot(1, 3, i+1)
-        plt.plot(pattern['pattern'])
-        plt.title(f'Pattern {i+1}\nFrequency: {pattern["frequency"]:.2f}')
-        plt.xlabel('Time')
-        plt.ylabel('Value')
-    plt.tight_layout()
-    plt.show()
-
+    fig = prepare_figure(fig, (15, 5))
+    axes = fig.subplots(1, 3)
+    for i, (ax, pattern) in enumerate(zip(axes, patterns)):
+        ax.plot(pattern['pattern'])
+        ax.set_title(f'Pattern {i+1}\nFrequency: {pattern["frequency"]:.2f}')
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Value')
+    fig.tight_layout()
+    
     return patterns
 
-def pattern_search_example(patterns):
+def pattern_search_example(patterns, fig=None):
     """Example of searching for similar patterns.
     
     Args:
         patterns: List of patterns extracted from extract_patterns_example()
+        fig: Optional Figure to draw into; it is cleared first
     
     This example shows:
     1. Adding extracted patterns to RAG system
@@ -62,53 +80,59 @@ def pattern_search_example(patterns):
     # Initialize RAG system
     embedder = TimeSeriesEmbedder()
     rag = TimeSeriesRAG()
-
+    
     # Add patterns to database
-    for i, pattern in enumerate(patterns):
-        embedding = embedder.embed(pattern['pattern'])
-        doc = TimeSeriesDocument(
+    embeddings = embedder.embed_batch(
+        np.stack([pattern['pattern'] for pattern in patterns]).astype(np.float32)
+    )
+    rag.add_documents([
+        TimeSeriesDocument(
             id=f'pattern_{i}',
             data=pattern['pattern'],
             metadata={'frequency': pattern['frequency']},
             embedding=embedding
         )
-        rag.add_document(doc)
-
+        for i, (pattern, embedding) in enumerate(zip(patterns, embeddings))
+    ])
+    
     # Create a query pattern (slightly modified version of first pattern)
-    query = patterns[0]['pattern'] + np.random.normal(0, 0.1, 
-                                                     size=len(patterns[0]['pattern']))
+    rng = np.random.default_rng(42)
+    query = patterns[0]['pattern'] + rng.normal(0, 0.1,
+                                                size=len(patterns[0]['pattern']))
     query_embedding = embedder.embed(query)
     results = rag.search(query_embedding, k=2)
-
+    
     # Visualize results
-    plt.figure(figsize=(10, 5))
+    fig = prepare_figure(fig, (10, 5))
+    axes = fig.subplots(1, 2)
+    
+    axes[0].plot(query)
+    axes[0].set_title('Query Pattern')
+    axes[0].set_xlabel('Time')
+    axes[0].set_ylabel('Value')
     
-    plt.subplot(1, 2, 1)
-    plt.plot(query)
-    plt.title('Query Pattern')
-    plt.xlabel('Time')
-    plt.ylabel('Value')
-
-    plt.subplot(1, 2, 2)
     for result in results:
-        plt.plot(result['data'], 
-                label=f'Pattern {result["id"]}\nDistance: {result["distance"]:.2f}')
-    plt.title('Similar Patterns')
-    plt.xlabel('Time')
-    plt.ylabel('Value')
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
-
-def seasonality_analysis_example():
+        axes[1].plot(result['data'], 
+                     label=f'Pattern {result["id"]}\nDistance: {result["distance"]:.2f}')
+    axes[1].set_title('Similar Patterns')
+    axes[1].set_xlabel('Time')
+    axes[1].set_ylabel('Value')
+    axes[1].legend()
+    fig.tight_layout()
+
+def seasonality_analysis_example(fig=None):
     """Example of analyzing seasonality in time series.
     
+    Args:
+        fig: Optional Figure to draw into; it is cleared first
+    
     This example demonstrates:
     1. Creating time series with known seasonality
     2. Detecting seasonality using analytics
     3. Visualizing the results
     """
     # Create synthetic data with multiple seasonal components
+    rng = np.random.default_rng(42)
     t = np.linspace(0, 30, 1000)
     
     # Daily and weekly patterns
@@ -116,34 +140,43 @@ def seasonality_analysis_example():
     weekly = 0.5 * np.sin(2 * np.pi * t / 7)  # 7-day period
     
     # Combine patterns with noise
-    data = daily + weekly + 0.1 * np.random.randn(len(t))
-
+    data = daily + weekly + 0.1 * rng.standard_normal(len(t))
+    
     # Analyze seasonality
     analytics = TimeSeriesAnalytics(data)
-    seasonality = analytics.detect_seasonality(max_period=10)
-
+    # max_period is in samples; one day is ~33 samples here
+    seasonality = analytics.detect_seasonality(max_period=50)
+    
     # Print results
     print("Seasonality Analysis:")
     print(f"Detected period: {seasonality['period']:.2f}")
     print(f"Strength: {seasonality['strength']:.2f}")
-
+    
     # Visualize data and detected seasonality
-    plt.figure(figsize=(12, 4))
-    plt.plot(t[:100], data[:100], label='Data')
-    plt.axvline(x=seasonality['period'], color='r', linestyle='--',
-                label=f'Detected Period: {seasonality["period"]:.2f}')
-    plt.title('Time Series with Detected Seasonality')
-    plt.xlabel('Time')
-    plt.ylabel('Value')
-    plt.legend()
-    plt.show()
+    fig = prepare_figure(fig, (12, 4))
+    ax = fig.subplots()
+    ax.plot(t[:100], data[:100], label='Data')
+    ax.axvline(x=seasonality['period'], color='r', linestyle='--',
+               label=f'Detected Period: {seasonality["period"]:.2f}')
+    ax.set_title('Time Series with Detected Seasonality')
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Value')
+    ax.legend()
 
 if __name__ == "__main__":
-    print("Running pattern extraction example...")
-    patterns = extract_patterns_example()
-    
-    print("\nRunning pattern search example...")
-    pattern_search_example(patterns)
-    
-    print("\nRunning seasonality analysis example...")
-    seasonality_analysis_example()
\ No newline at end of file
+    with plt.rc_context({'figure.max_open_warning': 0}):
+        fig = plt.figure()
+        
+        # The backend is non-interactive, so each plot is saved before the
+        # next example clears the Figure
+        print("Running pattern extraction example...")
+        patterns = extract_patterns_example(fig)
+        fig.savefig('pattern_extraction.png')
+        
+        print("\nRunning pattern search example...")
+        pattern_search_example(patterns, fig)
+        fig.savefig('pattern_search.png')
+        
+        print("\nRunning seasonality analysis example...")
+        seasonality_analysis_example(fig)
+        fig.savefig('seasonality_analysis.png')
\ No newline at end of file
@@ -17,14 +17,15 @@ def basic_example():
     4. Search for similar patterns
     """
     # Create sample data
+    rng = np.random.default_rng(42)
     t = np.linspace(0, 10, 100)
     sine_wave = np.sin(t)
-    noisy_sine = sine_wave + np.random.normal(0, 0.1, size=len(sine_wave))
-
+    noisy_sine = sine_wave + rng.normal(0, 0.1, size=len(sine_wave))
+    
     # Initialize components
     embedder = TimeSeriesEmbedder()
     rag = TimeSeriesRAG()
-
+    
     # Add original sine wave to RAG system
     embedding = embedder.embed(sine_wave)
     doc = TimeSeriesDocument(
@@ -34,11 +35,11 @@ def basic_example():
         embedding=embedding
     )
     rag.add_document(doc)
-
+    
     # Search using noisy sine wave
     query_embedding = embedder.embed(noisy_sine)
     results = rag.search(query_embedding, k=5)
-
+    
     # Print results
     for result in results:
         print(f"Document ID: {result['id']}")
@@ -46,16 +47,24 @@ def basic_example():
         print(f"Metadata: {result['metadata']}")
         print()
 
-def visualization_example():
+def visualization_example(fig=None):
     """Example showing how to visualize results.
     
+    Args:
+        fig: Optional Figure to draw into; it is cleared first
+    
+    Returns:
+        The Figure with the plots, e.g. for saving
+    
     This example demonstrates:
     1. Creating multiple time series
     2. Adding them to the RAG system
     3. Visualizing search results
     """
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend; docs are built headless
     import matplotlib.pyplot as plt
-
+    
     # Create sample data
     t = np.linspace(0, 10, 100)
     patterns = {
@@ -64,52 +73,56 @@ def visualization_example():
         'square': np.sign(np.sin(t)),
         'trend': 0.1 * t + np.sin(t)
     }
-
+    
     # Initialize components
     embedder = TimeSeriesEmbedder()
     rag = TimeSeriesRAG()
-
+    
     # Add patterns to RAG system
-    for name, data in patterns.items():
-        embedding = embedder.embed(data)
-        doc = TimeSeriesDocument(
+    embeddings = embedder.embed_batch(np.stack(list(patterns.values())))
+    rag.add_documents([
+        TimeSeriesDocument(
             id=name,
             data=data,
             metadata={"type": name},
             embedding=embedding
         )
-        rag.add_document(doc)
-
+        for (name, data), embedding in zip(patterns.items(), embeddings)
+    ])
+    
     # Create a query pattern (noisy sine)
-    query = patterns['sine'] + np.random.normal(0, 0.1, size=len(t))
+    rng = np.random.default_rng(42)
+    query = patterns['sine'] + rng.normal(0, 0.1, size=len(t))
     query_embedding = embedder.embed(query)
     results = rag.search(query_embedding, k=3)
-
+    
     # Visualize results
-    plt.figure(figsize=(12, 4))
+    if fig is None:
+        fig = plt.figure()
+    fig.clear()
+    fig.set_size_inches(12, 4)
+    axes = fig.subplots(1, 2)
     
     # Plot query
-    plt.subplot(1, 2, 1)
-    plt.plot(t, query)
-    plt.title('Query Pattern')
-    plt.xlabel('Time')
-    plt.ylabel('Value')
-
+    axes[0].plot(t, query)
+    axes[0].set_title('Query Pattern')
+    axes[0].set_xlabel('Time')
+    axes[0].set_ylabel('Value')
+    
     # Plot results
-    plt.subplot(1, 2, 2)
     for result in results:
-        plt.plot(t, result['data'], 
-                label=f"{result['id']} (dist: {result['distance']:.2f})")
-    plt.title('Similar Patterns')
-    plt.xlabel('Time')
-    plt.ylabel('Value')
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+        axes[1].plot(t, result['data'], 
+                     label=f"{result['id']} (dist: {result['distance']:.2f})")
+    axes[1].set_title('Similar Patterns')
+    axes[1].set_xlabel('Time')
+    axes[1].set_ylabel('Value')
+    axes[1].legend()
+    fig.tight_layout()
+    return fig
 
 if __name__ == "__main__":
     print("Running basic example:")
     basic_example()
     
     print("\nRunning visualization example:")
-    visualization_example()
\ No newline at end of file
+    visualization_example().savefig('quickstart_search.png')
\ No newline at end of file
@@ -3,5 +3,13 @@
 # Install the package
 pip install -e .
 
+# A persistent store can only be opened by one process; a second worker
+# would fail to boot and gunicorn would shut the whole server down
+if [ -n "$TIMESERIES_RAG_PERSIST_DIR" ]; then
+    WORKERS=1
+else
+    WORKERS=4
+fi
+
 # Start the server
-cd /home/site/wwwroot && gunicorn timeseries_rag.api:app --workers 4 --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000
+cd /home/site/wwwroot && gunicorn timeseries_rag.api:app --workers "$WORKERS" --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000
@@ -48,6 +48,10 @@ setup(
     packages=find_packages(where="src"),
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "numba": ["numba>=0.57.0"],
+        "pyarrow": ["pyarrow>=10.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "timeseries-rag=timeseries_rag.api:main",
@@ -5,11 +5,13 @@ including pattern recognition, anomaly detection, and classification.
 
 Example:
     >>> from timeseries_rag.analytics import TimeSeriesAnalytics
-    >>> import pandas as pd
+    >>> import numpy as np
     >>> 
-    >>> # Load data
-    >>> df = pd.read_csv('data/sensor/temperature.csv')
-    >>> analytics = TimeSeriesAnalytics(df['value'].values)
+    >>> # Load the value column (the first one) of a CSV with a header row
+    >>> values = np.loadtxt(
+    ...     'data/sensor/temperature.csv', delimiter=',', skiprows=1, usecols=0
+    ... )
+    >>> analytics = TimeSeriesAnalytics(values)
     >>> 
     >>> # Detect anomalies
     >>> anomalies = analytics.detect_anomalies()
@@ -18,10 +20,45 @@ Example:
 
 import numpy as np
 from typing import List, Tuple, Dict, Optional, Union
-from scipy import stats
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.cluster import DBSCAN
+
+# Heavy dependencies (scipy, faiss, numba) are imported inside the methods
+# that need them, so importing this module only costs numpy.
+
+# Series length crossovers for the autocorrelation strategy (see _get_acf)
+_DIRECT_ACF_MAX_SIZE = 1024
+_BLOCKED_ACF_MIN_SIZE = 1 << 20
+
+
+def _blocked_acf(x: np.ndarray, n_lags: int, block_size: int = 4096) -> np.ndarray:
+    """Compute the first ``n_lags`` autocorrelation lags block by block.
+    
+    Each block of ``x`` is correlated against itself extended by ``n_lags - 1``
+    following samples, and the per-block lags are summed. This is the
+    overlap-add idea applied to a bounded-lag autocorrelation: every FFT is
+    short, and the total cost is linear in ``len(x)``.
+    
+    Args:
+        x (np.ndarray): Zero-mean 1D series.
+        n_lags (int): Number of lags to compute, starting at lag 0.
+        block_size (int): Minimum number of samples per block.
+    
+    Returns:
+        np.ndarray: Unnormalized autocorrelation of shape (n_lags,).
+    """
+    from scipy.signal import fftconvolve
+    
+    block_size = max(block_size, 4 * n_lags)
+    n_blocks = -(-len(x) // block_size)
+    padded = np.zeros(n_blocks * block_size + n_lags - 1, dtype=x.dtype)
+    padded[:len(x)] = x
+    
+    blocks = padded[:n_blocks * block_size].reshape(n_blocks, block_size)
+    extended = np.lib.stride_tricks.sliding_window_view(
+        padded, block_size + n_lags - 1
+    )[::block_size]
+    lags = fftconvolve(extended, blocks[:, ::-1], mode='valid', axes=1)
+    return lags.sum(axis=0)
+
 
 class TimeSeriesAnalytics:
     """Advanced analytics for time series data.
@@ -30,8 +67,9 @@ class TimeSeriesAnalytics:
     pattern recognition, anomaly detection, and feature extraction.
     
     Attributes:
-        data (np.ndarray): The input time series data.
-        scaler (StandardScaler): Scaler for normalizing the data.
+        data (np.ndarray): The input time series data, stored as contiguous
+            float64. Reassigning it re-normalizes the series and invalidates
+            cached statistics.
     
     Example:
         >>> analytics = TimeSeriesAnalytics(time_series)
@@ -46,10 +84,66 @@ class TimeSeriesAnalytics:
             data (np.ndarray): Input time series data.
         """
         self.data = data
-        self.scaler = StandardScaler()
-        self._normalized_data = self.scaler.fit_transform(
-            data.reshape(-1, 1)
-        ).ravel()
+    
+    @property
+    def data(self) -> np.ndarray:
+        """np.ndarray: The input time series data.
+        
+        Assigning a new series re-normalizes it and clears cached statistics.
+        """
+        return self._data
+    
+    @data.setter
+    def data(self, data: np.ndarray) -> None:
+        # float64 keeps the moment/entropy features accurate; the bulk
+        # vector paths (FFT, sliding windows, FAISS) use a float32 copy
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        self._data = data
+        self._mean = float(data.mean())
+        self._std = float(data.std())
+        self._normalized_data = (data - self._mean) / (self._std + 1e-12)
+        self._normalized_data32 = self._normalized_data.astype(np.float32)
+        self._acf = None
+    
+    def _get_acf(self, max_lag: int) -> np.ndarray:
+        """Return the normalized autocorrelation for lags ``0..max_lag``.
+        
+        Only the requested lags are computed. The result is cached and later
+        calls slice it, recomputing only when a larger ``max_lag`` is needed.
+        
+        Args:
+            max_lag (int): Largest lag to return.
+        
+        Returns:
+            np.ndarray: Autocorrelation values normalized by the lag-0 value.
+        """
+        # Lags beyond len - 1 do not exist, so a cache covering all of them
+        # serves any larger max_lag too
+        n_needed = min(max_lag, len(self._normalized_data) - 1) + 1
+        if self._acf is None or len(self._acf) < n_needed:
+            from scipy.signal import fftconvolve
+            
+            # The normalized series is already zero-mean
+            x = self._normalized_data
+            n = len(x)
+            n_lags = min(max_lag, n - 1) + 1
+            
+            # Crossovers: below ~1k samples the whole series sits in L1 and a
+            # direct correlation beats FFT set-up costs; up to ~1M samples a
+            # single FFT convolution is fastest; beyond that, many small
+            # blocked FFTs keep the working set in L2.
+            if n < _DIRECT_ACF_MAX_SIZE:
+                acf = np.correlate(x, x, mode='full')[n - 1:n - 1 + n_lags]
+            elif n <= _BLOCKED_ACF_MIN_SIZE:
+                x32 = self._normalized_data32
+                acf = fftconvolve(x32, x32[::-1], mode='full')[n - 1:n - 1 + n_lags]
+            else:
+                acf = _blocked_acf(self._normalized_data32, n_lags)
+            
+            if acf[0] > 0:
+                acf = acf / acf[0]
+            self._acf = acf
+        return self._acf[:max_lag + 1]
     
     def detect_anomalies(
         self,
@@ -58,8 +152,9 @@ class TimeSeriesAnalytics:
     ) -> List[Tuple[int, float]]:
         """Detect anomalies using rolling statistics.
         
-        This method uses a combination of Z-score and DBSCAN to detect
-        anomalies in the time series.
+        Each point is scored against the mean and standard deviation of the
+        trailing window that ends at it; points whose absolute Z-score
+        exceeds ``threshold`` are reported.
         
         Args:
             window_size (int): Size of the rolling window. Defaults to 24.
@@ -68,28 +163,42 @@ class TimeSeriesAnalytics:
         
         Returns:
             List[Tuple[int, float]]: List of (index, value) pairs indicating
-                anomalies in the time series.
+                anomalies in the time series. Empty if the series is shorter
+                than ``window_size``.
         """
-        # Rolling statistics
-        rolling_mean = np.convolve(
-            self._normalized_data,
-            np.ones(window_size)/window_size,
-            mode='valid'
-        )
-        
-        # Pad the rolling mean
-        pad_size = len(self._normalized_data) - len(rolling_mean)
-        rolling_mean = np.pad(
-            rolling_mean,
-            (pad_size, 0),
-            mode='edge'
-        )
-        
-        # Calculate z-scores
-        z_scores = np.abs(self._normalized_data - rolling_mean)
-        
-        # Find anomalies
-        anomaly_indices = np.where(z_scores > threshold)[0]
+        from .numba_utils import NUMBA_AVAILABLE, rolling_zscore_anomalies
+        
+        x = self._normalized_data
+        w = window_size
+        
+        if len(x) < w:
+            # No full window to score against (the kernel's behavior too)
+            return []
+        
+        if NUMBA_AVAILABLE:
+            # Fused single-pass kernel, no intermediate arrays
+            anomaly_indices = rolling_zscore_anomalies(x, w, threshold)
+        else:
+            # Rolling mean and variance via cumulative sums
+            cs = np.concatenate(([0.0], np.cumsum(x)))
+            cs2 = np.concatenate(([0.0], np.cumsum(x * x)))
+            rolling_mean = (cs[w:] - cs[:-w]) / w
+            rolling_var = (cs2[w:] - cs2[:-w]) / w - rolling_mean ** 2
+            rolling_std = np.sqrt(np.maximum(rolling_var, 1e-12))
+            
+            # Pad the leading window so statistics align with the series
+            pad_size = len(x) - len(rolling_mean)
+            rolling_stats = np.pad(
+                np.stack([rolling_mean, rolling_std]),
+                ((0, 0), (pad_size, 0)),
+                mode='edge'
+            )
+            
+            # Calculate z-scores
+            z_scores = np.abs(x - rolling_stats[0]) / rolling_stats[1]
+            
+            # Find anomalies
+            anomaly_indices = np.where(z_scores > threshold)[0]
         
         return [(idx, self.data[idx]) for idx in anomaly_indices]
     
@@ -109,22 +218,23 @@ class TimeSeriesAnalytics:
         Returns:
             Dict[str, Union[int, float]]: Dictionary containing:
                 - period: Detected seasonality period
-                - strength: Strength of the seasonality (correlation)
+                - strength: Strength of the seasonality (normalized
+                  autocorrelation at the detected period)
         """
-        # Calculate autocorrelation
-        acf = np.correlate(self._normalized_data, self._normalized_data, mode='full')
-        acf = acf[len(acf)//2:]
+        # Calculate autocorrelation (cached across calls); this is a view of
+        # exactly lags 0..max_period, so no further slicing is needed
+        acf = self._get_acf(max_period)
         
         # Find peaks
         from scipy.signal import find_peaks
-        peaks, _ = find_peaks(acf[:max_period])
+        peaks, _ = find_peaks(acf)
         
         if len(peaks) == 0:
             return {'period': 0, 'strength': 0.0}
         
-        # Find strongest peak
-        peak_strengths = acf[peaks]
-        strongest_peak = peaks[np.argmax(peak_strengths[1:])]
+        # Strongest peak; find_peaks never reports lag 0, so every peak is a
+        # candidate period
+        strongest_peak = peaks[np.argmax(acf[peaks])]
         
         return {
             'period': int(strongest_peak),
@@ -134,50 +244,50 @@ class TimeSeriesAnalytics:
     def extract_patterns(
         self,
         window_size: int = 24,
-        n_patterns: int = 5
+        n_patterns: int = 5,
+        stride: int = 1
     ) -> List[Dict[str, Union[np.ndarray, float]]]:
         """Extract representative patterns from the time series.
         
-        This method uses sliding windows and clustering to find common
-        patterns in the time series.
+        This method clusters all sliding windows of the normalized series
+        with k-means and returns the cluster centroids as patterns.
         
         Args:
             window_size (int): Size of the sliding window. Defaults to 24.
             n_patterns (int): Number of patterns to extract. Defaults to 5.
+            stride (int): Only every ``stride``-th window is clustered, which
+                makes very long series proportionally cheaper to process.
+                Defaults to 1 (use all windows).
         
         Returns:
             List[Dict[str, Union[np.ndarray, float]]]: List of patterns,
                 each containing:
-                - pattern: The pattern values
-                - frequency: How often the pattern appears
+                - pattern: The pattern values (cluster centroid)
+                - frequency: Fraction of windows assigned to the pattern
+                Patterns are sorted by decreasing frequency.
         """
-        # Create sliding windows
+        import faiss
+        
+        # Create sliding windows as a single contiguous float32 copy
         windows = np.lib.stride_tricks.sliding_window_view(
-            self._normalized_data,
+            self._normalized_data32,
             window_size
-        )
+        )[::stride]
+        windows_f32 = np.ascontiguousarray(windows)
+        k = min(n_patterns, len(windows_f32))
         
-        # Reduce dimensionality
-        pca = PCA(n_components=min(window_size, 10))
-        windows_pca = pca.fit_transform(windows)
+        # Cluster patterns with FAISS k-means (SIMD L2 distances)
+        kmeans = faiss.Kmeans(d=window_size, k=k, niter=20, seed=0)
+        kmeans.train(windows_f32)
+        _, labels = kmeans.index.search(windows_f32, 1)
+        counts = np.bincount(labels.ravel(), minlength=k)
         
-        # Cluster patterns
-        clustering = DBSCAN(eps=0.5, min_samples=5)
-        labels = clustering.fit_predict(windows_pca)
-        
-        # Extract representative patterns
+        # Centroids are the representative patterns, most frequent first
         patterns = []
-        unique_labels = np.unique(labels)
-        unique_labels = unique_labels[unique_labels != -1]  # Remove noise
-        
-        for label in unique_labels[:n_patterns]:
-            pattern_indices = np.where(labels == label)[0]
-            pattern = np.mean(windows[pattern_indices], axis=0)
-            frequency = len(pattern_indices) / len(windows)
-            
+        for label in np.argsort(-counts, kind='stable'):
             patterns.append({
-                'pattern': pattern,
-                'frequency': frequency
+                'pattern': kmeans.centroids[label],
+                'frequency': float(counts[label] / len(windows_f32))
             })
         
         return patterns
@@ -189,31 +299,54 @@ class TimeSeriesAnalytics:
             Dict[str, float]: Dictionary of features including:
                 - mean: Mean value
                 - std: Standard deviation
-                - skewness: Skewness
-                - kurtosis: Kurtosis
+                - skewness: Skewness (0.0 for a constant series)
+                - kurtosis: Excess kurtosis (-3.0 for a constant series, whose
+                  central moments are all zero)
                 - trend: Linear trend coefficient
                 - seasonality_strength: Strength of seasonality
-                - entropy: Sample entropy
+                - entropy: Shannon entropy (bits) of a 64-bin histogram
+                  (0 for a constant series)
         """
+        from .numba_utils import NUMBA_AVAILABLE, histogram_fixed, series_moments
+        
+        if NUMBA_AVAILABLE:
+            # Higher moments and trend in a single pass over the data
+            n = len(self._data)
+            _, m2, m3, m4, trend_coef, lo, hi = series_moments(self._data)
+            if m2 > 0:
+                skewness = np.sqrt(n) * m3 / m2 ** 1.5
+                kurtosis = n * m4 / m2 ** 2 - 3.0
+            else:
+                skewness, kurtosis = 0.0, -3.0
+        else:
+            # Skewness and kurtosis are the third and fourth moments of the
+            # already standardized series
+            z = self._normalized_data
+            skewness = np.mean(z ** 3)
+            kurtosis = np.mean(z ** 4) - 3.0
+            t = np.arange(len(self._data))
+            trend_coef = np.polyfit(t, self._data, 1)[0]
+            lo, hi = self._data.min(), self._data.max()
+        
         # Basic statistics
         features = {
-            'mean': float(np.mean(self.data)),
-            'std': float(np.std(self.data)),
-            'skewness': float(stats.skew(self.data)),
-            'kurtosis': float(stats.kurtosis(self.data))
+            'mean': self._mean,
+            'std': self._std,
+            'skewness': float(skewness),
+            'kurtosis': float(kurtosis),
+            'trend': float(trend_coef)
         }
         
-        # Trend
-        t = np.arange(len(self.data))
-        trend_coef = np.polyfit(t, self.data, 1)[0]
-        features['trend'] = float(trend_coef)
-        
         # Seasonality
         seasonality = self.detect_seasonality()
         features['seasonality_strength'] = seasonality['strength']
         
-        # Entropy (using bins for continuous data)
-        hist, _ = np.histogram(self.data, bins='auto')
+        # Entropy over fixed-width bins spanning the data range
+        n_bins = 64
+        if NUMBA_AVAILABLE:
+            hist = histogram_fixed(self._data, lo, hi, n_bins)
+        else:
+            hist, _ = np.histogram(self._data, bins=n_bins, range=(lo, hi))
         hist = hist / hist.sum()
         entropy = -np.sum(hist * np.log2(hist + 1e-10))
         features['entropy'] = float(entropy)
@@ -6,9 +6,11 @@ patterns through a user-friendly interface.
 
 The module includes:
 - REST API endpoints for uploading and searching time series
+- Optional persistence of the document store across restarts (set the
+  ``TIMESERIES_RAG_PERSIST_DIR`` environment variable)
 - Interactive web interface with Plotly visualizations
 - CORS middleware for cross-origin requests
-- File upload handling for CSV data
+- File upload handling for CSV and ``.npy`` data
 - Error handling and validation
 
 Example:
@@ -23,29 +25,51 @@ Example:
     ```
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
+from starlette.concurrency import run_in_threadpool
 import uvicorn
+import asyncio
+import copy
+import os
 import numpy as np
-import pandas as pd
-import json
-from typing import List, Dict, Optional
-import uuid
+import orjson
+import hashlib
+import secrets
+import tempfile
+from typing import Any, BinaryIO, List, Dict, Optional, Tuple
+from contextlib import asynccontextmanager
 
+try:
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa_csv = None
+
+from .cache import QueryCache
 from .models import TimeSeriesEmbedder
 from .rag import TimeSeriesRAG, TimeSeriesDocument
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Stop the search batcher and save the document store on shutdown."""
+    yield
+    await search_batcher.close()
+    if rag_system.persist_dir is not None:
+        await run_in_threadpool(rag_system.save)
+        rag_system.close()
+
 # Create FastAPI application
 app = FastAPI(
     title="Time Series RAG",
     description="Time series similarity search and retrieval augmented generation",
     version="0.1.0",
     docs_url=None,  # Disable default docs
-    redoc_url=None  # Disable default redoc
+    redoc_url=None,  # Disable default redoc
+    lifespan=lifespan
 )
 
 def custom_openapi():
@@ -96,29 +120,287 @@ app.add_middleware(
 
 # Initialize models
 embedder = TimeSeriesEmbedder()
-rag_system = TimeSeriesRAG()
+
+# Documents persist across restarts if a directory is configured; they are
+# also saved every 100 uploads and on shutdown
+rag_system = TimeSeriesRAG(
+    persist_dir=os.getenv("TIMESERIES_RAG_PERSIST_DIR"),
+    autosave_every=100
+)
+
+# Search results of recent queries, invalidated whenever a document is added
+query_cache = QueryCache(max_size=512, similarity_threshold=0.95)
+
+# Document IDs of previous uploads, keyed by (content hash, metadata). The
+# raw upload bytes are not stored, so this map is not rebuilt from a
+# persisted store: re-uploads after a restart are stored again.
+uploaded_documents: Dict[Tuple[bytes, Optional[str]], str] = {}
+
+# Serializes document insertion with its dedupe check and cache invalidation
+write_lock = asyncio.Lock()
+
+class SearchBatcher:
+    """Coalesce concurrent search requests into batched index calls.
+    
+    Queries submitted within a short window of each other are stacked into
+    one (batch, embedding_dim) array and answered by a single
+    :meth:`TimeSeriesRAG.search_batch` call in the thread pool. Each batch is
+    searched with the largest requested ``k`` and the results truncated per
+    query. Queries of different embedding widths are searched separately,
+    so a malformed query fails on its own.
+    
+    Attributes:
+        rag (TimeSeriesRAG): The RAG system to search.
+        window (float): Seconds to wait for more queries after the first.
+        max_batch_size (int): Maximum number of queries per index call.
+    """
+    
+    def __init__(
+        self,
+        rag: TimeSeriesRAG,
+        window: float = 0.005,
+        max_batch_size: int = 64
+    ):
+        """Initialize the batcher.
+        
+        Args:
+            rag (TimeSeriesRAG): The RAG system to search.
+            window (float, optional): Coalescing window in seconds.
+                Defaults to 0.005.
+            max_batch_size (int, optional): Maximum number of queries per
+                index call. Defaults to 64.
+        """
+        self.rag = rag
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def search(self, query_embedding: np.ndarray, k: int) -> List[Dict]:
+        """Queue a query and wait for its results.
+        
+        Args:
+            query_embedding (np.ndarray): Embedding of the query.
+            k (int): Number of nearest neighbors to retrieve.
+        
+        Returns:
+            List[Dict]: Results in the format of :meth:`TimeSeriesRAG.search`.
+        
+        Raises:
+            ValueError: If ``k`` is less than 1.
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        
+        # The worker is started lazily on (and bound to) the running loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((query_embedding, k, future))
+        return await future
+    
+    async def close(self) -> None:
+        """Cancel the worker task, if one is running, and wait for it to exit."""
+        task, self._task, self._loop = self._task, None, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _run(self) -> None:
+        """Worker loop: gather a batch, search it, resolve the futures."""
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            groups: Dict[Tuple[int, ...], List[Tuple]] = {}
+            for item in batch:
+                groups.setdefault(item[0].shape, []).append(item)
+            for group in groups.values():
+                await self._search_group(group)
+    
+    async def _search_group(self, group: List[Tuple]) -> None:
+        """Search a group of same-shaped queries and resolve their futures.
+        
+        Any error is delivered to the group's futures rather than raised, so
+        the worker loop keeps running.
+        
+        Args:
+            group (List[Tuple]): ``(query_embedding, k, future)`` entries.
+        """
+        try:
+            queries = np.stack([embedding for embedding, _, _ in group])
+            k_max = max(k for _, k, _ in group)
+            batch_results = await run_in_threadpool(
+                self.rag.search_batch, queries, k_max
+            )
+        except Exception as e:
+            for _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, k, future), results in zip(group, batch_results):
+            if not future.done():
+                future.set_result(results[:k])
+
+search_batcher = SearchBatcher(rag_system)
+
+# Uploads larger than this are spooled from memory to a temporary file
+SPOOL_MAX_SIZE = 8 << 20
+
+# Content starting with the .npy magic string is parsed as .npy, not CSV
+NPY_MAGIC = b"\x93NUMPY"
+
+class NumpyJSONResponse(JSONResponse):
+    """JSON response that serializes NumPy arrays straight from their buffers.
+    
+    Uses ``orjson`` with ``OPT_SERIALIZE_NUMPY``, so time series data is never
+    converted to lists of Python floats. Arrays must be C-contiguous.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def _downsample(data: np.ndarray, max_points: Optional[int] = None) -> np.ndarray:
+    """Return a C-contiguous copy of ``data`` with at most ``max_points`` rows.
+    
+    Args:
+        data (np.ndarray): Time series data.
+        max_points (Optional[int], optional): Maximum number of samples to
+            keep, taken at an even stride. Defaults to None (keep all).
+    
+    Returns:
+        np.ndarray: The (possibly strided) data, ready for serialization.
+    """
+    data = np.asarray(data)
+    if max_points is not None and len(data) > max_points:
+        data = data[::-(-len(data) // max_points)]
+    return np.ascontiguousarray(data)
+
+def _parse_csv(fileobj: BinaryIO) -> np.ndarray:
+    """Parse numeric CSV content (with a header row) into a float32 array.
+    
+    Uses pyarrow's multithreaded CSV reader when pyarrow is installed, and
+    ``np.loadtxt`` otherwise. Neither builds a DataFrame.
+    
+    Args:
+        fileobj (BinaryIO): Binary file object positioned at the start of the
+            CSV content.
+    
+    Returns:
+        np.ndarray: Array of shape (n_samples, n_columns).
+    """
+    if pa_csv is not None:
+        table = pa_csv.read_csv(fileobj)
+        return np.column_stack([
+            column.to_numpy().astype(np.float32, copy=False)
+            for column in table.columns
+        ])
+    return np.loadtxt(
+        fileobj, dtype=np.float32, delimiter=",", skiprows=1, ndmin=2
+    )
+
+def _parse_npy(fileobj: BinaryIO) -> np.ndarray:
+    """Parse ``.npy`` content into a float32 array.
+    
+    Args:
+        fileobj (BinaryIO): Binary file object positioned at the start of the
+            ``.npy`` content.
+    
+    Returns:
+        np.ndarray: Array of shape (n_samples, n_columns); a 1D array is
+            treated as a single column.
+    
+    Raises:
+        ValueError: If the array is not 1D or 2D.
+    """
+    array = np.load(fileobj, allow_pickle=False)
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    if array.ndim != 2:
+        raise ValueError(f"Expected a 1D or 2D array, got {array.ndim}D")
+    return np.ascontiguousarray(array, dtype=np.float32)
+
+def _parse_series(fileobj: BinaryIO) -> np.ndarray:
+    """Parse ``.npy`` or CSV time series content.
+    
+    The format is detected from the ``.npy`` magic string rather than the
+    Content-Type, which clients set inconsistently (``curl -F`` sends CSV
+    files as ``application/octet-stream``).
+    
+    Args:
+        fileobj (BinaryIO): Binary file object positioned at the start of the
+            content.
+    
+    Returns:
+        np.ndarray: float32 array of shape (n_samples, n_columns).
+    """
+    is_npy = fileobj.read(len(NPY_MAGIC)) == NPY_MAGIC
+    fileobj.seek(0)
+    if is_npy:
+        return _parse_npy(fileobj)
+    return _parse_csv(fileobj)
+
+async def _spool_body(request: Request) -> Tuple[BinaryIO, bytes]:
+    """Stream a request body into a spooled temporary file.
+    
+    The body is consumed chunk by chunk rather than being buffered whole in
+    memory, and hashed on the way through so it can be used as a cache key.
+    
+    Args:
+        request (Request): Incoming request whose body is the CSV content.
+    
+    Returns:
+        Tuple[BinaryIO, bytes]: The temporary file, positioned at the start
+            of the content (the caller is responsible for closing it), and
+            the SHA-256 digest of the content.
+    """
+    tmp = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    digest = hashlib.sha256()
+    async for chunk in request.stream():
+        tmp.write(chunk)
+        digest.update(chunk)
+    tmp.seek(0)
+    return tmp, digest.digest()
 
 @app.post("/upload")
 async def upload_timeseries(
-    file: UploadFile = File(...),
+    request: Request,
     metadata: Optional[str] = None
 ) -> Dict[str, str]:
     """Upload a time series file with optional metadata.
     
-    This endpoint accepts a CSV file containing time series data and optional
-    metadata in JSON format. The time series is embedded and stored in the RAG
-    system for later retrieval.
+    This endpoint accepts CSV content containing time series data as the raw
+    request body, and optional metadata in JSON format as a query parameter.
+    A body in ``.npy`` format (detected by its magic string) is read as a
+    NumPy array instead.
+    The body is streamed rather than buffered whole. Parsing and embedding
+    run in the thread pool, so they do not block the event loop. The time
+    series is embedded and stored in the RAG system for later retrieval.
+    Re-uploading identical content with identical metadata returns the
+    existing document.
     
     Args:
-        file (UploadFile): CSV file containing time series data. Should have
-            one or more columns of numerical values.
+        request (Request): Request whose body is the CSV content. It should
+            have a header row and one or more columns of numerical values.
+            Alternatively, ``.npy`` content of a 1D or 2D array.
         metadata (Optional[str], optional): JSON string containing metadata
             about the time series. Defaults to None.
     
     Returns:
         Dict[str, str]: A dictionary containing:
             - status: "success" if upload was successful
-            - document_id: UUID of the stored document
+            - document_id: Random 32-character hex ID of the stored document
     
     Raises:
         HTTPException: If file reading, parsing, or storage fails.
@@ -127,27 +409,32 @@ async def upload_timeseries(
         ```python
         import requests
         
-        files = {'file': open('timeseries.csv', 'rb')}
         metadata = '{"type": "temperature", "location": "sensor1"}'
-        response = requests.post(
-            'http://localhost:50758/upload',
-            files=files,
-            data={'metadata': metadata}
-        )
+        with open('timeseries.csv', 'rb') as f:
+            response = requests.post(
+                'http://localhost:50758/upload',
+                data=f,
+                params={'metadata': metadata}
+            )
         print(response.json())
         ```
     """
     try:
-        content = await file.read()
-        df = pd.read_csv(content)
-        time_series = df.values
+        body, digest = await _spool_body(request)
+        with body:
+            # Deduplicate re-uploads of the same content
+            upload_key = (digest, metadata)
+            if upload_key in uploaded_documents:
+                return {"status": "success", "document_id": uploaded_documents[upload_key]}
+            
+            time_series = await run_in_threadpool(_parse_series, body)
         
         # Generate embedding
-        embedding = embedder.embed(time_series)
+        embedding = await run_in_threadpool(embedder.embed, time_series)
         
         # Create document
-        doc_id = str(uuid.uuid4())
-        metadata_dict = json.loads(metadata) if metadata else {}
+        doc_id = secrets.token_hex(16)
+        metadata_dict = orjson.loads(metadata) if metadata else {}
         
         doc = TimeSeriesDocument(
             id=doc_id,
@@ -156,32 +443,165 @@ async def upload_timeseries(
             embedding=embedding
         )
         
-        # Add to RAG system
-        rag_system.add_document(doc)
+        # Add to RAG system, unless a concurrent identical upload won the race
+        async with write_lock:
+            if upload_key in uploaded_documents:
+                return {"status": "success", "document_id": uploaded_documents[upload_key]}
+            await run_in_threadpool(rag_system.add_document, doc)
+            uploaded_documents[upload_key] = doc_id
+            query_cache.clear()
         
         return {"status": "success", "document_id": doc_id}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+def _parse_upload(fileobj: BinaryIO) -> Tuple[np.ndarray, bytes]:
+    """Hash and parse an uploaded CSV or ``.npy`` file.
+    
+    Args:
+        fileobj (BinaryIO): Binary file object positioned at the start of the
+            content.
+    
+    Returns:
+        Tuple[np.ndarray, bytes]: The parsed array and the SHA-256 digest of
+            the file content.
+    """
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(1 << 16), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return _parse_series(fileobj), digest.digest()
+
+@app.post("/upload_batch")
+async def upload_timeseries_batch(
+    files: List[UploadFile] = File(...),
+    metadata: Optional[str] = None
+) -> Dict[str, Any]:
+    """Upload many time series files in one request.
+    
+    This endpoint accepts a multipart upload of CSV (or ``.npy``) files in
+    the format of :func:`upload_timeseries`. The files are parsed in parallel in the thread
+    pool, series of equal shape are embedded together with one vectorized
+    :meth:`TimeSeriesEmbedder.embed_batch` call, and all new documents are
+    added to the RAG system at once.
+    
+    Args:
+        files (List[UploadFile]): CSV or ``.npy`` files, one time series each.
+        metadata (Optional[str], optional): JSON string containing metadata
+            stored with every uploaded time series. Defaults to None.
+    
+    Returns:
+        Dict[str, Any]: A dictionary containing:
+            - status: "success" if upload was successful
+            - document_ids: IDs of the stored documents, in file order
+              (files already uploaded with the same metadata return their
+              existing ID)
+    
+    Raises:
+        HTTPException: If file reading, parsing, or storage fails.
+    
+    Example:
+        ```python
+        import requests
+        
+        paths = ['sensor1.csv', 'sensor2.csv']
+        files = [('files', open(path, 'rb')) for path in paths]
+        response = requests.post(
+            'http://localhost:50758/upload_batch',
+            files=files,
+            params={'metadata': '{"type": "temperature"}'}
+        )
+        print(response.json())
+        ```
+    """
+    try:
+        parsed = await asyncio.gather(*[
+            run_in_threadpool(_parse_upload, upload.file) for upload in files
+        ])
+        metadata_dict = orjson.loads(metadata) if metadata else {}
+        
+        # New series, skipping re-uploads and duplicates within the batch
+        new_rows: Dict[Tuple[bytes, Optional[str]], int] = {}
+        for row, (_, digest) in enumerate(parsed):
+            upload_key = (digest, metadata)
+            if upload_key not in uploaded_documents:
+                new_rows.setdefault(upload_key, row)
+        
+        # Embed each group of equally shaped series in one vectorized call
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for row in new_rows.values():
+            groups.setdefault(parsed[row][0].shape, []).append(row)
+        embeddings: Dict[int, np.ndarray] = {}
+        for rows in groups.values():
+            batch = np.stack([parsed[row][0] for row in rows])
+            batch_embeddings = await run_in_threadpool(embedder.embed_batch, batch)
+            # Reject the whole batch before anything is stored
+            if batch_embeddings.shape[1] != rag_system.embedding_dim:
+                raise ValueError(
+                    f"Embedding dimension mismatch for {files[rows[0]].filename}. "
+                    f"Expected {rag_system.embedding_dim}, "
+                    f"got {batch_embeddings.shape[1]}"
+                )
+            embeddings.update(zip(rows, batch_embeddings))
+        
+        async with write_lock:
+            docs: Dict[Tuple[bytes, Optional[str]], TimeSeriesDocument] = {}
+            for upload_key, row in new_rows.items():
+                # A concurrent upload may have stored the same content
+                if upload_key in uploaded_documents:
+                    continue
+                docs[upload_key] = TimeSeriesDocument(
+                    id=secrets.token_hex(16),
+                    data=parsed[row][0],
+                    metadata=copy.deepcopy(metadata_dict),
+                    embedding=embeddings[row]
+                )
+            
+            if docs:
+                await run_in_threadpool(rag_system.add_documents, list(docs.values()))
+                # Only successfully stored documents become dedupe targets
+                for upload_key, doc in docs.items():
+                    uploaded_documents[upload_key] = doc.id
+                query_cache.clear()
+        
+        document_ids = [
+            uploaded_documents[(digest, metadata)] for _, digest in parsed
+        ]
+        return {"status": "success", "document_ids": document_ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/search")
 async def search_similar(
-    file: UploadFile = File(...),
-    k: int = 5
-) -> Dict[str, List[Dict]]:
+    request: Request,
+    k: int = Query(5, ge=1),
+    max_points: Optional[int] = Query(None, ge=1)
+) -> NumpyJSONResponse:
     """Search for similar time series patterns.
     
-    This endpoint accepts a CSV file containing a query time series and returns
-    the k most similar time series from the database.
+    This endpoint accepts CSV content containing a query time series as the
+    raw request body (or ``.npy`` content, as in :func:`upload_timeseries`)
+    and returns the k most similar time series from the database. Results
+    are cached: a re-submitted query (same content and k) is answered
+    without parsing or embedding it, and a query whose embedding has cosine
+    similarity above 0.95 to a recent query reuses its results.
+    Parsing, embedding and search run in the thread pool, so concurrent
+    requests proceed in parallel instead of blocking the event loop, and
+    searches arriving within 5 ms of each other share one index call.
     
     Args:
-        file (UploadFile): CSV file containing the query time series data.
+        request (Request): Request whose body is the query CSV or ``.npy``
+            content.
         k (int, optional): Number of similar patterns to retrieve. Defaults to 5.
+        max_points (Optional[int], optional): If given, each returned series
+            is downsampled to at most this many points (useful for plotting).
+            Defaults to None (full data).
     
     Returns:
-        Dict[str, List[Dict]]: A dictionary containing:
+        NumpyJSONResponse: JSON object containing:
             - results: List of similar time series, each with:
                 - id: Document ID
-                - distance: L2 distance to query
+                - distance: Distance to query (``2 - 2 * cosine similarity``)
                 - data: Time series values
                 - metadata: Document metadata
     
@@ -192,27 +612,43 @@ async def search_similar(
         ```python
         import requests
         
-        files = {'file': open('query.csv', 'rb')}
-        response = requests.post(
-            'http://localhost:50758/search',
-            files=files,
-            params={'k': 10}
-        )
+        with open('query.csv', 'rb') as f:
+            response = requests.post(
+                'http://localhost:50758/search',
+                data=f,
+                params={'k': 10}
+            )
         print(response.json())
         ```
     """
     try:
-        content = await file.read()
-        df = pd.read_csv(content)
-        query_ts = df.values
+        body, digest = await _spool_body(request)
+        with body:
+            # Exact hit: identical content and k
+            cache_key = (digest, k)
+            results = query_cache.get(cache_key)
+            if results is None:
+                query_ts = await run_in_threadpool(_parse_series, body)
         
-        # Generate embedding
-        query_embedding = embedder.embed(query_ts)
-        
-        # Search similar
-        results = rag_system.search(query_embedding, k=k)
+        if results is None:
+            # Generate embedding
+            query_embedding = await run_in_threadpool(embedder.embed, query_ts)
+            
+            # Semantic hit on a near-duplicate query, else search similar
+            n_docs = len(rag_system)
+            results = query_cache.get_similar(query_embedding, k)
+            if results is None:
+                results = await search_batcher.search(query_embedding, k)
+            
+            # Results that raced with an upload may be stale; don't cache them
+            if len(rag_system) == n_docs:
+                query_cache.put(cache_key, query_embedding, k, results)
         
-        return {"results": results}
+        # Serialize the raw arrays directly; cached results are not modified
+        return NumpyJSONResponse({"results": [
+            {**result, 'data': _downsample(result['data'], max_points)}
+            for result in results
+        ]})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -262,13 +698,15 @@ async def root() -> str:
         <script>
             document.getElementById('uploadForm').onsubmit = async (e) => {
                 e.preventDefault();
-                const formData = new FormData();
-                formData.append('file', document.getElementById('uploadFile').files[0]);
-                formData.append('metadata', document.getElementById('metadata').value);
+                const params = new URLSearchParams();
+                const metadata = document.getElementById('metadata').value;
+                if (metadata) {
+                    params.append('metadata', metadata);
+                }
                 
-                const response = await fetch('/upload', {
+                const response = await fetch('/upload?' + params, {
                     method: 'POST',
-                    body: formData
+                    body: document.getElementById('uploadFile').files[0]
                 });
                 const result = await response.json();
                 alert('Upload successful! Document ID: ' + result.document_id);
@@ -276,12 +714,10 @@ async def root() -> str:
             
             document.getElementById('searchForm').onsubmit = async (e) => {
                 e.preventDefault();
-                const formData = new FormData();
-                formData.append('file', document.getElementById('searchFile').files[0]);
                 
-                const response = await fetch('/search', {
+                const response = await fetch('/search?max_points=2000', {
                     method: 'POST',
-                    body: formData
+                    body: document.getElementById('searchFile').files[0]
                 });
                 const result = await response.json();
                 
@@ -299,7 +735,7 @@ async def root() -> str:
                     resultsDiv.appendChild(div);
                     
                     Plotly.newPlot(`plot${index}`, [{
-                        y: item.data,
+                        y: item.data.flat(),
                         type: 'scatter'
                     }]);
                 });
@@ -319,7 +755,6 @@ def main():
     - Uses port from environment variable if available
     - Disables reload in production
     """
-    import os
     port = int(os.getenv("PORT", "8000"))
     reload = os.getenv("ENVIRONMENT", "production").lower() != "production"
     
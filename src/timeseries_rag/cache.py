@@ -0,0 +1,173 @@
+"""Query Result Caching Module.
+
+This module provides a two-tier cache for similarity search results. The first
+tier is keyed by an exact hash of the query content, so a re-submitted query
+skips parsing, embedding and search entirely. The second tier compares the
+query embedding against the embeddings of recent queries and reuses the
+results of a near-duplicate.
+
+Example:
+    >>> cache = QueryCache(max_size=512)
+    >>> key = (hashlib.sha256(content).digest(), 5)
+    >>> results = cache.get(key)
+    >>> if results is None:
+    ...     embedding = embedder.embed(query)
+    ...     results = cache.get_similar(embedding, k=5)
+    ...     if results is None:
+    ...         results = rag.search(embedding, k=5)
+    ...     cache.put(key, embedding, 5, results)
+"""
+
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+class QueryCache:
+    """A two-tier (exact and semantic) cache for search results.
+    
+    Exact entries are kept in least-recently-used order and evicted beyond
+    ``max_size``. The unit-normalized embeddings of the last ``n_recent``
+    queries are kept in a ring buffer; a new query whose cosine similarity to
+    one of them exceeds ``similarity_threshold`` (for the same ``k``) reuses
+    that query's results.
+    
+    The semantic tier is only meaningful for embeddings that encode shape
+    rather than scale, such as those of :class:`TimeSeriesEmbedder`, whose
+    features are all computed from the normalized series. On raw-scale
+    features a shared offset would dominate the cosine similarity, and
+    unrelated series would be served each other's results.
+    
+    Cached results must be invalidated with :meth:`clear` whenever the
+    searched collection changes.
+    
+    Attributes:
+        max_size (int): Maximum number of exact entries.
+        n_recent (int): Number of recent query embeddings compared against.
+        similarity_threshold (float): Minimum cosine similarity for a
+            semantic hit.
+        exact_hits (int): Number of exact cache hits.
+        semantic_hits (int): Number of semantic cache hits.
+        misses (int): Number of lookups that missed both tiers.
+    
+    Example:
+        >>> cache = QueryCache(similarity_threshold=0.95)
+        >>> cache.put(key, embedding, 5, results)
+        >>> cache.get(key) is results
+        True
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 512,
+        n_recent: int = 64,
+        similarity_threshold: float = 0.95
+    ):
+        """Initialize the cache.
+        
+        Args:
+            max_size (int, optional): Maximum number of exact entries.
+                Defaults to 512.
+            n_recent (int, optional): Number of recent query embeddings
+                compared against for semantic hits. Defaults to 64.
+            similarity_threshold (float, optional): Minimum cosine similarity
+                for a semantic hit. Defaults to 0.95.
+        """
+        self.max_size = max_size
+        self.n_recent = n_recent
+        self.similarity_threshold = similarity_threshold
+        self.clear()
+    
+    def clear(self) -> None:
+        """Remove all cached entries and reset the hit counters."""
+        self._exact: "OrderedDict[Hashable, List[Dict[str, Any]]]" = OrderedDict()
+        self._recent: Optional[np.ndarray] = None
+        self._recent_k = np.zeros(self.n_recent, dtype=np.int64)
+        self._recent_results: List[Optional[List[Dict[str, Any]]]] = [None] * self.n_recent
+        self._n_stored = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Look up the results stored under an exact key.
+        
+        Args:
+            key (Hashable): Exact cache key, e.g. ``(sha256_digest, k)``.
+        
+        Returns:
+            Optional[List[Dict[str, Any]]]: The cached results, or None.
+        """
+        results = self._exact.get(key)
+        if results is not None:
+            self._exact.move_to_end(key)
+            self.exact_hits += 1
+        return results
+    
+    def get_similar(
+        self,
+        embedding: np.ndarray,
+        k: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Look up the results of a recent query with a near-identical embedding.
+        
+        Args:
+            embedding (np.ndarray): Embedding of the query.
+            k (int): Number of results requested; only recent queries with the
+                same ``k`` are considered.
+        
+        Returns:
+            Optional[List[Dict[str, Any]]]: The cached results, or None. A
+                query whose size differs from the cached embeddings always
+                misses.
+        """
+        n = min(self._n_stored, self.n_recent)
+        if n > 0 and np.size(embedding) == self._recent.shape[1]:
+            similarities = self._recent[:n] @ self._unit(embedding)
+            similarities[self._recent_k[:n] != k] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] > self.similarity_threshold:
+                self.semantic_hits += 1
+                return self._recent_results[best]
+        
+        self.misses += 1
+        return None
+    
+    def put(
+        self,
+        key: Hashable,
+        embedding: np.ndarray,
+        k: int,
+        results: List[Dict[str, Any]]
+    ) -> None:
+        """Store search results under an exact key and a query embedding.
+        
+        Args:
+            key (Hashable): Exact cache key, e.g. ``(sha256_digest, k)``.
+            embedding (np.ndarray): Embedding of the query. It is only kept
+                for semantic lookups if its size matches the embeddings
+                already cached.
+            k (int): Number of results that were requested.
+            results (List[Dict[str, Any]]): Search results to cache.
+        """
+        self._exact[key] = results
+        self._exact.move_to_end(key)
+        if len(self._exact) > self.max_size:
+            self._exact.popitem(last=False)
+        
+        unit = self._unit(embedding)
+        if self._recent is None:
+            self._recent = np.zeros((self.n_recent, unit.shape[0]), dtype=np.float32)
+        elif unit.shape[0] != self._recent.shape[1]:
+            return
+        slot = self._n_stored % self.n_recent
+        self._recent[slot] = unit
+        self._recent_k[slot] = k
+        self._recent_results[slot] = results
+        self._n_stored += 1
+    
+    @staticmethod
+    def _unit(embedding: np.ndarray) -> np.ndarray:
+        """Return ``embedding`` flattened and scaled to unit L2 norm."""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -8,14 +8,93 @@ Example:
     >>> embedder = TimeSeriesEmbedder(target_length=256)
     >>> time_series = [1.0, 2.0, 3.0, 2.0, 1.0]
     >>> embedding = embedder.embed(time_series)
-    >>> print(embedding.shape)
-    (1, 260)  # 256 resampled points + 4 statistical features
+    >>> print(embedding.shape, embedding.dtype)
+    (260,) float32  # 256 resampled points + 4 statistical features
 """
 
+import functools
+import threading
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from scipy.signal import resample
-from typing import Union, List, Tuple
+from scipy.signal import firwin, resample_poly
+from typing import Optional, Union, List, Sequence, Tuple
+
+
+@functools.lru_cache(maxsize=64)
+def _resample_plan(
+    n_in: int,
+    target_length: int
+) -> Tuple[int, Optional[np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
+    """Precompute everything :func:`_resample` needs for one pair of lengths.
+    
+    Production traffic mostly repeats a handful of input lengths, so the
+    anti-aliasing filter design (a Kaiser-windowed ``firwin``, which costs as
+    much as the filtering itself) and the interpolation indices and weights
+    are computed once per ``(n_in, target_length)`` and cached.
+    
+    Args:
+        n_in (int): Number of input samples.
+        target_length (int): Number of output samples.
+    
+    Returns:
+        Tuple[int, Optional[np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
+            ``(factor, taps, i0, i1, w)``: the integer decimation factor, the
+            FIR taps (None when no decimation is needed), and for each output
+            point the two neighbouring (decimated) samples and the weight of
+            the second. The arrays are read-only.
+    """
+    positions = np.linspace(0, n_in - 1, target_length)
+    
+    # An integer decimation factor keeps the FIR filter short (~20 taps per
+    # unit of factor); a rational up/down ratio would need one proportional
+    # to the series length. The taps match resample_poly's own design.
+    factor = n_in // target_length
+    taps = None
+    n = n_in
+    if factor >= 2:
+        taps = firwin(20 * factor + 1, 1.0 / factor, window=('kaiser', 5.0))
+        n = -(-n_in // factor)
+        positions = np.minimum(positions / factor, n - 1)
+    
+    i0 = np.minimum(positions.astype(np.intp), max(n - 2, 0))
+    i1 = np.minimum(i0 + 1, n - 1)
+    w = positions - i0
+    for array in (taps, i0, i1, w):
+        if array is not None:
+            array.setflags(write=False)
+    return factor, taps, i0, i1, w
+
+
+def _resample(x: np.ndarray, target_length: int, axis: int = 0) -> np.ndarray:
+    """Resample ``x`` to ``target_length`` samples along ``axis``.
+    
+    Series at least twice as long as the target are first decimated by the
+    integer factor ``len // target_length`` with a polyphase anti-aliasing FIR
+    filter (``scipy.signal.resample_poly``), which is O(N) and, unlike FFT
+    resampling, does not ring on non-periodic series. The (decimated) series
+    is then linearly interpolated onto ``target_length`` evenly spaced points
+    spanning the original samples. Filter taps and interpolation weights come
+    from a per-length cache (see :func:`_resample_plan`).
+    
+    Args:
+        x (np.ndarray): Array to resample.
+        target_length (int): Number of output samples along ``axis``.
+        axis (int, optional): Time axis of ``x``. Defaults to 0.
+    
+    Returns:
+        np.ndarray: Resampled array with ``target_length`` samples along ``axis``.
+    """
+    factor, taps, i0, i1, w = _resample_plan(x.shape[axis], target_length)
+    if factor >= 2:
+        x = resample_poly(x, 1, factor, axis=axis, window=taps, padtype='line')
+    
+    # Linear interpolation: blend each output point's two neighbours
+    w = w.reshape((-1,) + (1,) * (x.ndim - 1 - axis))
+    return np.take(x, i0, axis=axis) * (1.0 - w) + np.take(x, i1, axis=axis) * w
+
+
+# Largest scratch buffer (in float64 elements, 4 MiB) kept per thread
+_SCRATCH_MAX_SIZE = 1 << 19
+
 
 class TimeSeriesEmbedder:
     """A class for converting time series data into fixed-length embeddings.
@@ -27,8 +106,6 @@ class TimeSeriesEmbedder:
     Attributes:
         target_length (int): The desired length of the resampled time series.
             Default is 256 points.
-        scaler (StandardScaler): A scikit-learn StandardScaler instance for
-            normalizing the time series data.
     
     Example:
         >>> embedder = TimeSeriesEmbedder(target_length=128)
@@ -45,30 +122,74 @@ class TimeSeriesEmbedder:
                 time series. Defaults to 256.
         """
         self.target_length = target_length
-        self.scaler = StandardScaler()
+        
+        # Per-thread scratch memory for the intermediates of embed()
+        self._local = threading.local()
+    
+    def _scratch(self, size: int) -> np.ndarray:
+        """Return this thread's float64 scratch buffer, grown to ``size`` elements.
+        
+        The buffer is reused across calls on the same thread, so steady-state
+        embedding of similarly sized series allocates no intermediates. It is
+        kept only up to ``_SCRATCH_MAX_SIZE`` elements, so a burst of large
+        series cannot pin memory in every pool thread; larger requests get a
+        fresh array that is released after the call.
+        
+        Args:
+            size (int): Minimum number of elements required.
+        
+        Returns:
+            np.ndarray: A 1D view of exactly ``size`` elements.
+        """
+        if size > _SCRATCH_MAX_SIZE:
+            return np.empty(size)
+        
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or len(buffer) < size:
+            grown = 2 * len(buffer) if buffer is not None else 0
+            buffer = np.empty(min(max(size, grown), _SCRATCH_MAX_SIZE))
+            self._local.buffer = buffer
+        return buffer[:size]
     
-    def embed(self, time_series: Union[List[float], np.ndarray]) -> np.ndarray:
+    def embed(
+        self,
+        time_series: Union[List[float], np.ndarray],
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """Convert time series to embedding vector using resampling and statistical features.
         
         This method performs the following steps:
         1. Converts input to numpy array if necessary
         2. Reshapes to 2D array if necessary
-        3. Normalizes the time series using StandardScaler
-        4. Resamples to fixed length using scipy.signal.resample
-        5. Extracts statistical features (mean, std, max, min)
+        3. Normalizes each feature to zero mean and unit variance
+        4. Resamples to fixed length (polyphase decimation for long series,
+           linear interpolation otherwise)
+        5. Extracts statistical features (mean, std, max and min of the
+           normalized series, so the embedding is invariant to offset and
+           scale)
         6. Combines resampled values with statistical features
         
+        The normalized series and statistics are written to per-thread
+        scratch memory, and the result straight into its output array.
+        
         Args:
             time_series (Union[List[float], np.ndarray]): Input time series data.
                 Can be a 1D list/array or 2D array with shape (n_samples, n_features).
+            out (Optional[np.ndarray], optional): C-contiguous float32 array of
+                shape (embedding_dim,) to write the embedding into, e.g. a row
+                of a preallocated matrix. Defaults to None (allocate a new
+                array).
         
         Returns:
-            np.ndarray: A 2D array of shape (1, target_length + 4) containing the
-                embedding vector. The first target_length elements are the resampled
-                values, followed by mean, std, max, and min statistics.
+            np.ndarray: A C-contiguous float32 array of shape (target_length + 4,)
+                containing the embedding vector (``out`` if given). The first target_length
+                elements are the resampled values, followed by mean, std, max, and
+                min statistics of the normalized series.
         
         Raises:
-            ValueError: If the input time series is empty or has invalid dimensions.
+            ValueError: If the input time series is empty, has invalid dimensions
+                or contains NaN or infinite values, or if ``out`` has the wrong
+                shape.
         """
         if isinstance(time_series, list):
             time_series = np.array(time_series)
@@ -78,26 +199,107 @@ class TimeSeriesEmbedder:
             
         if time_series.size == 0:
             raise ValueError("Input time series is empty")
+        
+        # Non-finite values would propagate into the embedding and the index
+        if not np.isfinite(time_series).all():
+            raise ValueError("Input time series contains NaN or infinite values")
             
-        # Normalize
-        time_series = self.scaler.fit_transform(time_series)
+        from .numba_utils import NUMBA_AVAILABLE, fused_stats_normalize
+        
+        n_features = time_series.shape[1]
+        n_resampled = self.target_length * n_features
+        embedding_dim = n_resampled + 4 * n_features
+        if out is None:
+            out = np.empty(embedding_dim, dtype=np.float32)
+        elif out.shape != (embedding_dim,):
+            raise ValueError(
+                f"Output shape mismatch. Expected {(embedding_dim,)}, "
+                f"got {out.shape}"
+            )
+        
+        # Intermediates live in the thread's scratch buffer
+        scratch = self._scratch(time_series.size + 4 * n_features)
+        normalized = scratch[:time_series.size].reshape(time_series.shape)
+        stats = scratch[time_series.size:].reshape(4, n_features)
+        
+        # Normalize (zero variance scales by 1). The normalized series has
+        # mean 0 and std 1 (0 if constant) by construction, so those features
+        # need no extra pass
+        if NUMBA_AVAILABLE:
+            # Statistics and normalization fused into one kernel
+            fused_stats_normalize(time_series, normalized, stats)
+        else:
+            mean = np.mean(time_series, axis=0)
+            std = np.std(time_series, axis=0)
+            np.subtract(time_series, mean, out=normalized)
+            np.divide(normalized, np.where(std > 0, std, 1.0), out=normalized)
+            stats[0] = 0.0
+            stats[1] = std > 0
+            np.max(normalized, axis=0, out=stats[2])
+            np.min(normalized, axis=0, out=stats[3])
+        
+        # Resample to fixed length and combine features (mean, std, max, min)
+        out[:n_resampled] = _resample(normalized, self.target_length).ravel()
+        out[n_resampled:] = stats.ravel()
+        
+        return out
+    
+    def embed_batch(
+        self,
+        time_series_batch: Union[np.ndarray, Sequence[Union[List[float], np.ndarray]]]
+    ) -> np.ndarray:
+        """Convert a batch of time series to embedding vectors.
+        
+        Equal-length series are normalized, resampled and summarized in a
+        single vectorized pass over the whole batch, which amortizes the
+        per-call overhead of :meth:`embed`. A sequence of series with
+        different lengths falls back to embedding each series separately.
+        
+        Args:
+            time_series_batch (Union[np.ndarray, Sequence]): Either an array
+                of shape (batch, n_samples) or (batch, n_samples, n_features),
+                or a sequence of time series accepted by :meth:`embed`.
+        
+        Returns:
+            np.ndarray: A 2D float32 array of shape (batch, embedding_dim) whose
+                rows match the output of :meth:`embed` for each series.
+        
+        Raises:
+            ValueError: If the batch or any of its time series is empty, or
+                contains NaN or infinite values.
+        """
+        if not isinstance(time_series_batch, np.ndarray):
+            if len(time_series_batch) == 0:
+                raise ValueError("Input batch is empty")
+            series = [np.asarray(ts) for ts in time_series_batch]
+            if len({ts.shape for ts in series}) > 1:
+                return np.stack([self.embed(ts) for ts in series])
+            time_series_batch = np.stack(series)
+        
+        if time_series_batch.ndim == 2:
+            time_series_batch = time_series_batch[:, :, np.newaxis]
+        
+        if time_series_batch.size == 0:
+            raise ValueError("Input batch is empty")
+        
+        if not np.isfinite(time_series_batch).all():
+            raise ValueError("Input batch contains NaN or infinite values")
         
-        # Resample to fixed length
-        resampled = resample(time_series, self.target_length)
+        # Normalize each series and feature (zero variance scales by 1)
+        mean = np.mean(time_series_batch, axis=1, keepdims=True)
+        std = np.std(time_series_batch, axis=1, keepdims=True)
+        normalized = np.subtract(time_series_batch, mean, dtype=np.float64)
+        np.divide(normalized, np.where(std > 0, std, 1.0), out=normalized)
         
-        # Extract statistical features
-        mean = np.mean(time_series, axis=0)
-        std = np.std(time_series, axis=0)
-        max_val = np.max(time_series, axis=0)
-        min_val = np.min(time_series, axis=0)
+        # Resample the whole batch to fixed length
+        resampled = _resample(normalized, self.target_length, axis=1)
         
         # Combine features
-        features = np.concatenate([
-            resampled.flatten(),
-            mean,
-            std,
-            max_val,
-            min_val
-        ])
-        
-        return features.reshape(1, -1)
\ No newline at end of file
+        batch_size = len(normalized)
+        return np.concatenate([
+            resampled.reshape(batch_size, -1),
+            np.zeros((batch_size, normalized.shape[2])),
+            (std > 0).reshape(batch_size, -1),
+            np.max(normalized, axis=1),
+            np.min(normalized, axis=1)
+        ], axis=1, dtype=np.float32)
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""Numba-Accelerated Kernels.
+
+This module contains fused, single-pass kernels for the hot loops of the
+package. Numba is an optional dependency (``pip install timeseries_rag[numba]``);
+when it is not installed, ``NUMBA_AVAILABLE`` is False and callers fall back to
+their vectorized NumPy implementations.
+
+Example:
+    >>> from timeseries_rag.numba_utils import NUMBA_AVAILABLE
+    >>> if NUMBA_AVAILABLE:
+    ...     from timeseries_rag.numba_utils import rolling_zscore_anomalies
+    ...     idx = rolling_zscore_anomalies(x, 24, 3.0)
+"""
+
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def rolling_zscore_anomalies(
+    x: np.ndarray,
+    window_size: int,
+    threshold: float
+) -> np.ndarray:
+    """Find points whose trailing-window Z-score exceeds a threshold.
+    
+    Rolling mean, variance, Z-score and the threshold test are fused into a
+    single pass that keeps running sums (subtracting the sample leaving the
+    window and adding the one entering it), so no intermediate arrays are
+    allocated. Points before the first full window are scored against the
+    statistics of the first window.
+    
+    The kernel is sequential and releases the GIL, so independent series can
+    be processed in parallel from a thread pool. (A ``parallel=True`` kernel
+    called from several threads can deadlock against FAISS's OpenMP runtime
+    at interpreter shutdown.)
+    
+    Args:
+        x (np.ndarray): 1D float64 time series.
+        window_size (int): Size of the trailing window.
+        threshold (float): Absolute Z-score threshold.
+    
+    Returns:
+        np.ndarray: Sorted int64 indices of the anomalous points.
+    """
+    n = x.shape[0]
+    w = window_size
+    flags = np.zeros(n, dtype=np.bool_)
+    if n < w:
+        return np.flatnonzero(flags)
+    
+    s = 0.0
+    s2 = 0.0
+    for j in range(w):
+        s += x[j]
+        s2 += x[j] * x[j]
+    
+    # Leading points share the statistics of the first full window
+    mean = s / w
+    std = np.sqrt(max(s2 / w - mean * mean, 1e-12))
+    for i in range(w):
+        if abs(x[i] - mean) > threshold * std:
+            flags[i] = True
+    
+    for i in range(w, n):
+        old = x[i - w]
+        new = x[i]
+        s += new - old
+        s2 += new * new - old * old
+        mean = s / w
+        var = max(s2 / w - mean * mean, 1e-12)
+        if abs(new - mean) > threshold * np.sqrt(var):
+            flags[i] = True
+    
+    return np.flatnonzero(flags)
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def series_moments(
+    x: np.ndarray
+) -> Tuple[float, float, float, float, float, float, float]:
+    """Compute central moments, linear trend and range in a single pass.
+    
+    Uses Welford's online update extended to the third and fourth central
+    moments, together with a running co-moment against the sample index
+    ``t = 0..n-1`` for the least-squares slope.
+    
+    Args:
+        x (np.ndarray): Non-empty 1D time series.
+    
+    Returns:
+        Tuple[float, float, float, float, float, float, float]: ``(mean, m2,
+            m3, m4, slope, min, max)`` where ``m2..m4`` are sums of squared,
+            cubed and fourth powers of deviations from the mean. For a
+            constant series ``m2..m4`` and the slope are 0.
+    """
+    lo = x[0]
+    hi = x[0]
+    mean = 0.0
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    t_mean = 0.0
+    t_m2 = 0.0
+    c_tx = 0.0
+    
+    for i in range(x.shape[0]):
+        n = i + 1.0
+        value = x[i]
+        if value < lo:
+            lo = value
+        elif value > hi:
+            hi = value
+        
+        delta = value - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * i
+        mean += delta_n
+        m4 += (term1 * delta_n2 * (n * n - 3.0 * n + 3.0)
+               + 6.0 * delta_n2 * m2 - 4.0 * delta_n * m3)
+        m3 += term1 * delta_n * (n - 2.0) - 3.0 * delta_n * m2
+        m2 += term1
+        
+        dt = i - t_mean
+        t_mean += dt / n
+        c_tx += dt * (value - mean)
+        t_m2 += dt * (i - t_mean)
+    
+    slope = c_tx / t_m2 if t_m2 > 0 else 0.0
+    return mean, m2, m3, m4, slope, lo, hi
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def histogram_fixed(
+    x: np.ndarray,
+    lo: float,
+    hi: float,
+    n_bins: int
+) -> np.ndarray:
+    """Count values into ``n_bins`` equal-width bins spanning ``[lo, hi]``.
+    
+    Unlike ``np.histogram(..., bins='auto')`` this needs no sort and makes a
+    single O(N) pass; the maximum value falls into the last bin. If
+    ``lo == hi`` (a constant series) every value falls into the first bin.
+    
+    Args:
+        x (np.ndarray): 1D time series.
+        lo (float): Lower edge of the first bin (normally ``x.min()``).
+        hi (float): Upper edge of the last bin (normally ``x.max()``).
+        n_bins (int): Number of bins.
+    
+    Returns:
+        np.ndarray: float64 bin counts of shape (n_bins,).
+    """
+    hist = np.zeros(n_bins)
+    scale = n_bins / (hi - lo) if hi > lo else 0.0
+    for i in range(x.shape[0]):
+        b = int((x[i] - lo) * scale)
+        if b >= n_bins:
+            b = n_bins - 1
+        elif b < 0:
+            b = 0
+        hist[b] += 1.0
+    return hist
+
+
+@njit(fastmath=True, cache=True, nogil=True)
+def fused_stats_normalize(
+    x: np.ndarray,
+    out_norm: np.ndarray,
+    out_stats: np.ndarray
+) -> None:
+    """Standardize each column of ``x`` and collect its summary statistics.
+    
+    Each column is processed with tight, vectorizable loops: one pass for the
+    sum, minimum and maximum, one that writes the centered series while
+    accumulating the sum of squared deviations (the same two-pass variance
+    NumPy uses), and one that scales it in place. No temporaries are
+    allocated. A column with zero variance is scaled by 1.
+    
+    Args:
+        x (np.ndarray): 2D array of shape (n_samples, n_features).
+        out_norm (np.ndarray): float64 output array with the shape of ``x``
+            that receives the normalized series.
+        out_stats (np.ndarray): float64 output array of shape (4, n_features)
+            that receives, row by row, the mean, standard deviation, maximum
+            and minimum of the normalized series. The mean is 0 and the
+            standard deviation 1 (0 for a constant column) by construction.
+    """
+    n, c = x.shape
+    for j in range(c):
+        total = 0.0
+        lo = x[0, j]
+        hi = x[0, j]
+        for i in range(n):
+            value = x[i, j]
+            total += value
+            lo = min(lo, value)
+            hi = max(hi, value)
+        # fastmath may reorder the sum, so pin a constant column's mean
+        # exactly; otherwise rounding noise would be scaled up to +-1
+        mean = lo if lo == hi else total / n
+        
+        sq_dev = 0.0
+        for i in range(n):
+            delta = x[i, j] - mean
+            out_norm[i, j] = delta
+            sq_dev += delta * delta
+        std = np.sqrt(sq_dev / n)
+        scale = 1.0 / std if std > 0 else 1.0
+        
+        for i in range(n):
+            out_norm[i, j] *= scale
+        
+        out_stats[0, j] = 0.0
+        out_stats[1, j] = 1.0 if std > 0 else 0.0
+        out_stats[2, j] = (hi - mean) * scale
+        out_stats[3, j] = (lo - mean) * scale
@@ -27,9 +27,19 @@ Example:
 """
 
 import faiss
+import os
+import pickle
+import threading
 import numpy as np
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Union
+from typing import BinaryIO, Callable, Iterator, List, Dict, Any, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
 
 @dataclass
 class TimeSeriesDocument:
@@ -60,16 +70,118 @@ class TimeSeriesDocument:
     metadata: Dict[str, Any]
     embedding: Optional[np.ndarray] = None
 
+def _dump_array(array: np.ndarray, path: str) -> None:
+    """Save ``array`` in ``.npy`` format to exactly ``path``."""
+    with open(path, 'wb') as f:
+        np.save(f, array)
+
+def _dump_pickle(obj: Any, path: str) -> None:
+    """Pickle ``obj`` to ``path``."""
+    with open(path, 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _lock_exclusive(path: str) -> BinaryIO:
+    """Open ``path`` and take a non-blocking, exclusive, process-wide lock on it.
+    
+    The lock is held until the returned file is closed (or the process
+    exits).
+    
+    Raises:
+        RuntimeError: If another open file (normally another process) holds
+            the lock.
+    """
+    f = open(path, 'a+b')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover - Windows
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        raise RuntimeError(
+            f"{os.path.dirname(path)} is in use by another process; a "
+            f"persistent store can only be opened by one process (run a "
+            f"single server worker)"
+        ) from None
+    return f
+
+class _ReadWriteLock:
+    """A lock that admits many concurrent readers or a single writer.
+    
+    FAISS indices support concurrent searches but not searches concurrent
+    with ``add``/``train``, so searches take the read side and anything that
+    mutates the store takes the write side.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+    
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock shared for the duration of the block."""
+        with self._condition:
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock exclusively for the duration of the block."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._readers == 0)
+            yield
+
 class TimeSeriesRAG:
     """A class implementing Retrieval Augmented Generation for time series data.
     
     This class provides functionality for storing time series documents and
-    retrieving similar patterns using FAISS vector similarity search.
+    retrieving similar patterns using FAISS vector similarity search. An HNSW
+    graph over 8-bit scalar-quantized vectors gives sub-linear search time
+    while storing each embedding dimension in one byte instead of four; new
+    embeddings are buffered and added to the index in a single batch before
+    the next search.
+    
+    Embeddings are scaled to unit L2 norm when stored and at query time, and
+    compared by inner product (cosine similarity). Reported distances are the
+    equivalent squared L2 distance between the unit vectors, ``2 - 2 * cos``,
+    so smaller still means more similar.
+    
+    The quantizer is trained on the first ``train_size`` embeddings. Until
+    that many documents have been added, searches are answered exactly by a
+    brute-force scan over the stored embeddings.
+    
+    Documents are stored column-wise: IDs, metadata and raw data live in
+    parallel lists, and all embeddings in one contiguous float32 matrix that
+    grows geometrically.
+    
+    Instances are thread-safe: searches run concurrently (FAISS releases the
+    GIL), while adding documents and flushing them into the index are
+    exclusive.
+    
+    If ``persist_dir`` is given, :meth:`save` writes the store there and a
+    new instance created with the same directory reloads it, so documents
+    survive restarts without being re-embedded. Raw data is kept in an
+    append-only file and memory-mapped on load.
     
     Attributes:
         embedding_dim (int): Dimension of the time series embeddings.
-        index (faiss.Index): FAISS index for similarity search.
-        documents (List[TimeSeriesDocument]): List of stored time series documents.
+        index (faiss.Index): FAISS HNSW scalar-quantized index for
+            similarity search.
+        train_size (int): Number of embeddings the quantizer is trained on.
+        ids (List[str]): Document IDs, in insertion order.
+        metadata (List[Dict[str, Any]]): Document metadata, aligned with ``ids``.
+        data (List[np.ndarray]): Raw time series data, aligned with ``ids``.
+        persist_dir (Optional[str]): Directory the store is saved to and
+            loaded from, or None for an in-memory store.
+        autosave_every (int): Save automatically once this many documents
+            have been added since the last save (0 disables autosave).
     
     Example:
         >>> rag = TimeSeriesRAG(embedding_dim=260)
@@ -78,39 +190,243 @@ class TimeSeriesRAG:
         >>> results = rag.search(query_embedding, k=5)
     """
     
-    def __init__(self, embedding_dim: int = 260):
+    # File names inside persist_dir
+    _INDEX_FILE = "index.faiss"
+    _EMBEDDINGS_FILE = "embeddings.npy"
+    _DATA_FILE = "data.bin"
+    _DOCUMENTS_FILE = "documents.pkl"
+    _LOCK_FILE = ".lock"
+    
+    # Maximum number of rows passed to a single index.add call
+    _FLUSH_CHUNK_SIZE = 1024
+    
+    def __init__(
+        self,
+        embedding_dim: int = 260,
+        hnsw_m: int = 32,
+        ef_construction: int = 40,
+        ef_search: int = 16,
+        initial_capacity: int = 1024,
+        train_size: int = 1000,
+        persist_dir: Optional[str] = None,
+        autosave_every: int = 0
+    ):
         """Initialize the TimeSeriesRAG system.
         
         Args:
             embedding_dim (int, optional): Dimension of the time series embeddings.
                 Should match the output dimension of your embedding model.
                 Defaults to 260 (256 resampled points + 4 statistical features).
+            hnsw_m (int, optional): Number of neighbors per node in the HNSW
+                graph. Defaults to 32.
+            ef_construction (int, optional): Candidate list size used while
+                building the graph. Defaults to 40.
+            ef_search (int, optional): Minimum candidate list size used while
+                searching; it is raised to ``k`` for larger queries. Higher
+                values trade speed for recall. Defaults to 16.
+            initial_capacity (int, optional): Number of embedding rows
+                allocated up front; the buffer doubles when full.
+                Defaults to 1024.
+            train_size (int, optional): Number of embeddings to collect
+                before training the 8-bit scalar quantizer and building the
+                index. Defaults to 1000.
+            persist_dir (Optional[str], optional): Directory to save the
+                store to. If it already contains a saved store, that store is
+                loaded. The directory is locked for exclusive use by this
+                instance until :meth:`close`. Defaults to None (in-memory
+                only).
+            autosave_every (int, optional): Call :meth:`save` automatically
+                once this many documents have been added since the last save.
+                Requires ``persist_dir``. Defaults to 0 (disabled).
+        
+        Raises:
+            ValueError: If a saved store has a different embedding dimension.
+            FileNotFoundError: If a saved store is missing some of its files.
+            RuntimeError: If another process has ``persist_dir`` open.
         """
         self.embedding_dim = embedding_dim
-        self.index = faiss.IndexFlatL2(embedding_dim)
-        self.documents: List[TimeSeriesDocument] = []
+        self.ef_search = ef_search
+        self.train_size = train_size
+        self.index = faiss.IndexHNSWSQ(
+            embedding_dim,
+            faiss.ScalarQuantizer.QT_8bit,
+            hnsw_m,
+            faiss.METRIC_INNER_PRODUCT
+        )
+        self.index.hnsw.efConstruction = ef_construction
         
-    def add_document(self, doc: TimeSeriesDocument) -> None:
-        """Add a time series document to the RAG system.
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.data: List[np.ndarray] = []
+        self._embeddings = np.empty(
+            (max(initial_capacity, 1), embedding_dim), dtype=np.float32
+        )
+        self._id_to_row: Dict[str, int] = {}
+        self._lock = _ReadWriteLock()
         
-        Args:
-            doc (TimeSeriesDocument): The document to add. Must have a valid
-                embedding for similarity search.
+        self.persist_dir = persist_dir
+        self.autosave_every = autosave_every
+        # (offset, shape, dtype) of each document's raw data in the data file
+        self._data_layout: List[Tuple[int, Tuple[int, ...], str]] = []
+        self._n_saved = 0
+        self._dir_lock: Optional[BinaryIO] = None
+        if persist_dir is not None:
+            # Several processes appending to one data file and replacing each
+            # other's sidecars would corrupt the store
+            os.makedirs(persist_dir, exist_ok=True)
+            self._dir_lock = _lock_exclusive(self._path(self._LOCK_FILE))
+            if os.path.exists(self._path(self._INDEX_FILE)):
+                try:
+                    self._load()
+                except BaseException:
+                    self.close()
+                    raise
+    
+    def __len__(self) -> int:
+        """Return the number of stored documents."""
+        return len(self.ids)
+    
+    @property
+    def embeddings(self) -> np.ndarray:
+        """np.ndarray: (n_documents, embedding_dim) float32 view of the stored,
+        unit-normalized embeddings."""
+        return self._embeddings[:len(self.ids)]
+    
+    @property
+    def documents(self) -> List[TimeSeriesDocument]:
+        """List[TimeSeriesDocument]: The stored documents, built on access."""
+        return [self._document(row) for row in range(len(self.ids))]
+    
+    def _document(self, row: int) -> TimeSeriesDocument:
+        """Assemble the document stored at ``row``."""
+        return TimeSeriesDocument(
+            id=self.ids[row],
+            data=self.data[row],
+            metadata=self.metadata[row],
+            embedding=self._embeddings[row]
+        )
+    
+    def _validate(self, doc: TimeSeriesDocument) -> None:
+        """Check that a document has an embedding of the right dimension.
         
         Raises:
             ValueError: If the document's embedding is None or has incorrect shape.
         """
         if doc.embedding is None:
             raise ValueError("Document must have an embedding")
-            
+        
         if doc.embedding.shape[-1] != self.embedding_dim:
             raise ValueError(
                 f"Embedding dimension mismatch. Expected {self.embedding_dim}, "
                 f"got {doc.embedding.shape[-1]}"
             )
+    
+    def _reserve(self, n_new: int) -> int:
+        """Make room for ``n_new`` more embedding rows.
+        
+        Args:
+            n_new (int): Number of rows about to be appended.
+        
+        Returns:
+            int: Row at which the new embeddings start.
+        """
+        start = len(self.ids)
+        capacity = len(self._embeddings)
+        if start + n_new > capacity:
+            while start + n_new > capacity:
+                capacity *= 2
+            grown = np.empty((capacity, self.embedding_dim), dtype=np.float32)
+            grown[:start] = self._embeddings[:start]
+            self._embeddings = grown
+        return start
+    
+    def _append(self, doc: TimeSeriesDocument) -> None:
+        """Append a document's ID, metadata and data to the column lists."""
+        self._id_to_row.setdefault(doc.id, len(self.ids))
+        self.ids.append(doc.id)
+        self.metadata.append(doc.metadata)
+        self.data.append(doc.data)
+    
+    def add_document(self, doc: TimeSeriesDocument) -> None:
+        """Add a time series document to the RAG system.
+        
+        Args:
+            doc (TimeSeriesDocument): The document to add. Must have a valid
+                embedding for similarity search.
+        
+        Raises:
+            ValueError: If the document's embedding is None or has incorrect shape.
+        """
+        self._validate(doc)
+        with self._lock.write():
+            row = self._reserve(1)
+            self._embeddings[row] = doc.embedding
+            faiss.normalize_L2(self._embeddings[row:row + 1])
+            self._append(doc)
+        self._maybe_autosave()
+    
+    def add_documents(self, docs: List[TimeSeriesDocument]) -> None:
+        """Add several time series documents to the RAG system at once.
+        
+        All embeddings are written into the contiguous embedding matrix in a
+        single copy, so the whole batch reaches the index in bulk.
+        
+        Args:
+            docs (List[TimeSeriesDocument]): The documents to add. Each must
+                have a valid embedding for similarity search.
+        
+        Raises:
+            ValueError: If any document's embedding is None or has incorrect
+                shape. No document is added in that case.
+        """
+        if not docs:
+            return
+        
+        for doc in docs:
+            self._validate(doc)
+        
+        with self._lock.write():
+            start = self._reserve(len(docs))
+            np.concatenate(
+                [doc.embedding.reshape(1, -1) for doc in docs],
+                out=self._embeddings[start:start + len(docs)],
+                casting='same_kind'
+            )
+            faiss.normalize_L2(self._embeddings[start:start + len(docs)])
+            for doc in docs:
+                self._append(doc)
+        self._maybe_autosave()
+    
+    def _flush(self) -> None:
+        """Add all embeddings not yet in the index in bulk.
+        
+        Rows past ``index.ntotal`` in the embedding matrix are pending.
+        Inserting into the HNSW graph one row at a time pays the Python/C++
+        crossing per document; adding contiguous slices of up to
+        ``_FLUSH_CHUNK_SIZE`` rows amortizes it while bounding the temporary
+        memory FAISS allocates per call. The quantizer is trained first, once
+        ``train_size`` embeddings are available.
+        """
+        if not self._needs_flush():
+            return
+        
+        with self._lock.write():
+            # Another thread may have flushed while we waited for the lock
+            if not self._needs_flush():
+                return
             
-        self.index.add(doc.embedding.reshape(1, -1))
-        self.documents.append(doc)
+            n_docs = len(self.ids)
+            if not self.index.is_trained:
+                self.index.train(self._embeddings[:n_docs])
+            for start in range(self.index.ntotal, n_docs, self._FLUSH_CHUNK_SIZE):
+                stop = min(start + self._FLUSH_CHUNK_SIZE, n_docs)
+                self.index.add(self._embeddings[start:stop])
+    
+    def _needs_flush(self) -> bool:
+        """Whether there are pending embeddings that can be indexed now."""
+        if self.index.is_trained:
+            return self.index.ntotal < len(self.ids)
+        return len(self.ids) >= self.train_size
     
     def search(
         self,
@@ -129,34 +445,221 @@ class TimeSeriesRAG:
             List[Dict[str, Any]]: A list of dictionaries containing search results.
                 Each dictionary has the following keys:
                 - 'id': Document ID
-                - 'distance': L2 distance to query
-                - 'data': Raw time series data
+                - 'distance': Squared L2 distance between the unit-normalized
+                  query and document embeddings (``2 - 2 * cosine similarity``)
+                - 'data': Raw time series data (the stored array, not a copy)
                 - 'metadata': Document metadata
         
         Raises:
             ValueError: If query_embedding has incorrect shape.
         """
-        if query_embedding.shape[-1] != self.embedding_dim:
+        return self.search_batch(query_embedding.reshape(1, -1), k)[0]
+    
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        k: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for similar time series patterns for several queries at once.
+        
+        All queries are answered by a single index call, which amortizes the
+        per-call overhead and keeps the index hot in cache across queries.
+        
+        Args:
+            query_embeddings (np.ndarray): Array of shape (n_queries,
+                embedding_dim) with one query embedding per row.
+            k (int, optional): Number of nearest neighbors to retrieve per
+                query. Defaults to 5.
+        
+        Returns:
+            List[List[Dict[str, Any]]]: One result list per query, in the
+                format returned by :meth:`search`.
+        
+        Raises:
+            ValueError: If query_embeddings has incorrect shape.
+        """
+        if query_embeddings.ndim != 2 or query_embeddings.shape[1] != self.embedding_dim:
             raise ValueError(
                 f"Query embedding dimension mismatch. Expected {self.embedding_dim}, "
-                f"got {query_embedding.shape[-1]}"
+                f"got {query_embeddings.shape[-1]}"
             )
             
-        distances, indices = self.index.search(
-            query_embedding.reshape(1, -1), k
-        )
+        self._flush()
+        queries = np.array(query_embeddings, dtype=np.float32, order='C')
+        faiss.normalize_L2(queries)
+        with self._lock.read():
+            if self.index.is_trained:
+                params = faiss.SearchParametersHNSW(efSearch=max(self.ef_search, k))
+                similarities, indices = self.index.search(queries, k, params=params)
+            elif self.ids:
+                # Too few documents to train the quantizer yet: exact scan
+                similarities, indices = faiss.knn(
+                    queries,
+                    self.embeddings,
+                    min(k, len(self.ids)),
+                    metric=faiss.METRIC_INNER_PRODUCT
+                )
+            else:
+                return [[] for _ in range(len(queries))]
+            
+            # Squared L2 distance between unit vectors
+            distances = np.maximum(2.0 - 2.0 * similarities, 0.0)
+            
+            # FAISS pads missing neighbors with -1
+            ids, data, metadata = self.ids, self.data, self.metadata
+            valid = (indices >= 0) & (indices < len(ids))
+            return [
+                [
+                    {
+                        'id': ids[idx],
+                        'distance': distance,
+                        'data': data[idx],
+                        'metadata': metadata[idx]
+                    }
+                    for idx, distance in zip(
+                        row_indices[row_valid].tolist(),
+                        row_distances[row_valid].tolist()
+                    )
+                ]
+                for row_indices, row_distances, row_valid in zip(indices, distances, valid)
+            ]
+    
+    def close(self) -> None:
+        """Release the lock on ``persist_dir`` (no-op without persistence).
+        
+        Unsaved documents are not written; call :meth:`save` first.
+        """
+        if self._dir_lock is not None:
+            self._dir_lock.close()
+            self._dir_lock = None
+    
+    def _path(self, name: str) -> str:
+        """Return the path of a file inside ``persist_dir``."""
+        return os.path.join(self.persist_dir, name)
+    
+    def _maybe_autosave(self) -> None:
+        """Save if ``autosave_every`` documents were added since the last save."""
+        if (
+            self.persist_dir is not None
+            and self.autosave_every > 0
+            and len(self.ids) - self._n_saved >= self.autosave_every
+        ):
+            self.save()
+    
+    def save(self) -> None:
+        """Write the store to ``persist_dir``.
+        
+        Raw data of documents added since the last save is appended to the
+        data file; the embeddings, the document sidecar (IDs, metadata and
+        data layout) and the FAISS index are rewritten atomically, in that
+        order, so an interrupted save leaves a loadable store. Embeddings
+        not yet in the index are re-added on the next search after loading.
+        
+        Raises:
+            ValueError: If no ``persist_dir`` was configured.
+        """
+        if self.persist_dir is None:
+            raise ValueError("No persist_dir configured")
+        os.makedirs(self.persist_dir, exist_ok=True)
+        
+        with self._lock.write():
+            n_docs = len(self.ids)
+            with open(self._path(self._DATA_FILE), 'ab') as f:
+                offset = f.tell()
+                for row in range(len(self._data_layout), n_docs):
+                    data = np.ascontiguousarray(self.data[row])
+                    self._data_layout.append((offset, data.shape, data.dtype.str))
+                    f.write(data.tobytes())
+                    offset += data.nbytes
+            
+            self._write_atomic(
+                self._EMBEDDINGS_FILE,
+                lambda path: _dump_array(self._embeddings[:n_docs], path)
+            )
+            state = {
+                'ids': self.ids[:n_docs],
+                'metadata': self.metadata[:n_docs],
+                'data_layout': self._data_layout[:n_docs]
+            }
+            self._write_atomic(
+                self._DOCUMENTS_FILE,
+                lambda path: _dump_pickle(state, path)
+            )
+            self._write_atomic(
+                self._INDEX_FILE,
+                lambda path: faiss.write_index(self.index, path)
+            )
+            self._n_saved = n_docs
+    
+    def _write_atomic(self, name: str, write: Callable[[str], None]) -> None:
+        """Write a file in ``persist_dir`` via a temporary file and rename."""
+        path = self._path(name)
+        tmp_path = path + ".tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    
+    def _load(self) -> None:
+        """Load a store previously written by :meth:`save`.
         
-        results = []
-        for i, idx in enumerate(indices[0]):
-            if idx < len(self.documents):
-                doc = self.documents[idx]
-                results.append({
-                    'id': doc.id,
-                    'distance': float(distances[0][i]),
-                    'data': doc.data.tolist(),
-                    'metadata': doc.metadata
-                })
-        return results
+        The FAISS index is read with ``IO_FLAG_MMAP`` and the raw data file
+        is memory-mapped, so series are only paged in when accessed.
+        
+        Raises:
+            ValueError: If the saved store has a different embedding dimension.
+            FileNotFoundError: If any of the store's files is missing.
+        """
+        missing = [
+            name for name in (
+                self._INDEX_FILE,
+                self._EMBEDDINGS_FILE,
+                self._DATA_FILE,
+                self._DOCUMENTS_FILE
+            )
+            if not os.path.exists(self._path(name))
+        ]
+        if missing:
+            raise FileNotFoundError(
+                f"Incomplete store in {self.persist_dir}: missing "
+                f"{', '.join(missing)}"
+            )
+        
+        index = faiss.read_index(self._path(self._INDEX_FILE), faiss.IO_FLAG_MMAP)
+        if index.d != self.embedding_dim:
+            raise ValueError(
+                f"Embedding dimension mismatch. Expected {self.embedding_dim}, "
+                f"saved index has {index.d}"
+            )
+        index.hnsw.efConstruction = self.index.hnsw.efConstruction
+        
+        with open(self._path(self._DOCUMENTS_FILE), 'rb') as f:
+            state = pickle.load(f)
+        n_docs = len(state['ids'])
+        
+        # Views into the memory-mapped data file
+        data = []
+        if n_docs > 0:
+            raw = np.memmap(self._path(self._DATA_FILE), dtype=np.uint8, mode='r')
+            for offset, shape, dtype in state['data_layout']:
+                count = int(np.prod(shape))
+                data.append(
+                    np.frombuffer(raw, dtype=dtype, count=count, offset=offset).reshape(shape)
+                )
+        
+        embeddings = np.load(self._path(self._EMBEDDINGS_FILE), mmap_mode='r')
+        
+        self.index = index
+        self.ids = list(state['ids'])
+        self.metadata = list(state['metadata'])
+        self.data = data
+        self._data_layout = list(state['data_layout'])
+        self._embeddings = np.empty(
+            (max(len(self._embeddings), n_docs), self.embedding_dim), dtype=np.float32
+        )
+        self._embeddings[:n_docs] = embeddings[:n_docs]
+        self._id_to_row = {}
+        for row, doc_id in enumerate(self.ids):
+            self._id_to_row.setdefault(doc_id, row)
+        self._n_saved = n_docs
     
     def get_document_by_id(self, doc_id: str) -> Optional[TimeSeriesDocument]:
         """Retrieve a document by its ID.
@@ -167,7 +670,5 @@ class TimeSeriesRAG:
         Returns:
             Optional[TimeSeriesDocument]: The document if found, None otherwise.
         """
-        for doc in self.documents:
-            if doc.id == doc_id:
-                return doc
-        return None
\ No newline at end of file
+        row = self._id_to_row.get(doc_id)
+        return self._document(row) if row is not None else None
@@ -0,0 +1,104 @@
+"""Tests for time series analytics."""
+
+import numpy as np
+import pytest
+
+from timeseries_rag.analytics import TimeSeriesAnalytics
+
+
+@pytest.mark.parametrize("period", [24, 50])
+def test_detect_seasonality_finds_known_period(period):
+    t = np.arange(24 * period)
+    analytics = TimeSeriesAnalytics(np.sin(2 * np.pi * t / period))
+    seasonality = analytics.detect_seasonality()
+    assert seasonality["period"] == period
+    assert seasonality["strength"] > 0.9
+
+
+def test_acf_cache_hits_when_max_lag_exceeds_series():
+    analytics = TimeSeriesAnalytics(np.sin(np.arange(100) / 5.0))
+    first = analytics.detect_seasonality()
+    acf = analytics._acf
+    assert analytics.detect_seasonality() == first
+    assert analytics._acf is acf
+
+
+def _anomaly_series(n):
+    rng = np.random.default_rng(0)
+    x = np.sin(np.arange(n) / 10.0) + 0.1 * rng.normal(size=n)
+    x[n // 2] += 5.0
+    return x
+
+
+@pytest.mark.parametrize("n", [10, 24, 500])
+def test_detect_anomalies_numba_matches_fallback(monkeypatch, n):
+    from timeseries_rag import numba_utils
+    
+    x = _anomaly_series(n)
+    fused = TimeSeriesAnalytics(x).detect_anomalies(window_size=24)
+    monkeypatch.setattr(numba_utils, "NUMBA_AVAILABLE", False)
+    fallback = TimeSeriesAnalytics(x).detect_anomalies(window_size=24)
+    
+    assert [idx for idx, _ in fused] == [idx for idx, _ in fallback]
+    if n < 24:
+        assert fused == []
+    elif n == 500:
+        assert 250 in [idx for idx, _ in fused]
+
+
+def _feature_series():
+    rng = np.random.default_rng(1)
+    t = np.arange(2000)
+    return [
+        20 + 3 * np.sin(2 * np.pi * t / 24) + rng.gamma(2.0, size=len(t)) + 1e-3 * t,
+        rng.normal(size=777),
+        np.full(300, 4.5)
+    ]
+
+
+@pytest.mark.parametrize("series_index", range(3))
+def test_calculate_features_numba_matches_fallback(monkeypatch, series_index):
+    from timeseries_rag import numba_utils
+    
+    x = _feature_series()[series_index]
+    fused = TimeSeriesAnalytics(x).calculate_features()
+    monkeypatch.setattr(numba_utils, "NUMBA_AVAILABLE", False)
+    fallback = TimeSeriesAnalytics(x).calculate_features()
+    
+    assert fused.keys() == fallback.keys()
+    for name in ("mean", "std", "skewness", "kurtosis", "trend"):
+        assert fused[name] == pytest.approx(fallback[name], rel=1e-6, abs=1e-9)
+
+
+def test_calculate_features_of_constant_series():
+    features = TimeSeriesAnalytics(np.full(300, 4.5)).calculate_features()
+    assert features["std"] == 0.0
+    assert features["skewness"] == 0.0
+    assert features["kurtosis"] == -3.0
+    assert features["trend"] == pytest.approx(0.0, abs=1e-12)
+
+
+@pytest.mark.parametrize("series_index", range(3))
+def test_entropy_numba_matches_fallback(monkeypatch, series_index):
+    from timeseries_rag import numba_utils
+    
+    x = _feature_series()[series_index]
+    fused = TimeSeriesAnalytics(x).calculate_features()["entropy"]
+    monkeypatch.setattr(numba_utils, "NUMBA_AVAILABLE", False)
+    fallback = TimeSeriesAnalytics(x).calculate_features()["entropy"]
+    assert fused == pytest.approx(fallback, abs=1e-9)
+
+
+def test_histogram_fixed_matches_numpy():
+    from timeseries_rag.numba_utils import histogram_fixed
+    
+    rng = np.random.default_rng(2)
+    for x in (rng.normal(size=10001), np.arange(1000.0)):
+        lo, hi = x.min(), x.max()
+        expected, _ = np.histogram(x, bins=64, range=(lo, hi))
+        np.testing.assert_array_equal(histogram_fixed(x, lo, hi, 64), expected)
+    
+    # An empty range puts everything in the first bin (NumPy widens the
+    # range and uses the middle one); the entropy is 0 either way
+    hist = histogram_fixed(np.full(50, 2.0), 2.0, 2.0, 64)
+    assert hist[0] == 50 and hist.sum() == 50
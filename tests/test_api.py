@@ -0,0 +1,288 @@
+"""Tests for the REST API."""
+
+import asyncio
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from timeseries_rag import api
+from timeseries_rag.cache import QueryCache
+from timeseries_rag.rag import TimeSeriesRAG
+
+
+def _use_store(monkeypatch, rag):
+    """Point the API at ``rag`` with empty caches."""
+    monkeypatch.setattr(api, "rag_system", rag)
+    monkeypatch.setattr(api, "query_cache", QueryCache())
+    monkeypatch.setattr(api, "uploaded_documents", {})
+    monkeypatch.setattr(api, "search_batcher", api.SearchBatcher(rag))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A client against a fresh, empty, in-memory store."""
+    _use_store(monkeypatch, TimeSeriesRAG())
+    with TestClient(api.app) as client:
+        yield client
+
+
+def _csv(values, header="value"):
+    buffer = io.BytesIO()
+    np.savetxt(buffer, values, delimiter=",", header=header, comments="")
+    return buffer.getvalue()
+
+
+def test_upload_rejects_non_finite_values(client):
+    values = np.sin(np.linspace(0, 10, 100))
+    values[3] = np.nan
+    response = client.post("/upload", content=_csv(values))
+    assert response.status_code == 400
+    assert "NaN" in response.json()["detail"]
+    assert len(api.rag_system) == 0
+
+
+@pytest.mark.parametrize("max_points, status_code", [
+    (-3, 422), (0, 422), (1, 200), (10, 200)
+])
+def test_search_validates_max_points(client, max_points, status_code):
+    values = np.sin(np.linspace(0, 10, 100))
+    client.post("/upload", content=_csv(values))
+    response = client.post(
+        "/search",
+        content=_csv(values),
+        params={"k": 1, "max_points": max_points}
+    )
+    assert response.status_code == status_code
+    if status_code == 200:
+        data = response.json()["results"][0]["data"]
+        assert len(data) == max_points
+        assert data[0] == [0.0]
+
+
+def test_search_dimension_mismatch_after_cached_query(client):
+    t = np.linspace(0, 10, 100)
+    client.post("/upload", content=_csv(np.sin(t)))
+    assert client.post("/search", content=_csv(np.cos(t))).status_code == 200
+    
+    response = client.post(
+        "/search",
+        content=_csv(np.stack([t, np.sin(t)], axis=1), header="a,b")
+    )
+    assert response.status_code == 400
+    assert "dimension mismatch" in response.json()["detail"]
+
+
+class _RecordingRAG:
+    """Stand-in for TimeSeriesRAG that records search_batch calls."""
+    
+    def __init__(self, dim=4, fail=False):
+        self.dim = dim
+        self.fail = fail
+        self.calls = []
+    
+    def search_batch(self, queries, k):
+        self.calls.append((queries.shape, k))
+        if self.fail:
+            raise RuntimeError("index unavailable")
+        if queries.shape[1] != self.dim:
+            raise ValueError("Query embedding dimension mismatch")
+        return [
+            [{"id": f"{int(query[0])}-{i}"} for i in range(k)]
+            for query in queries
+        ]
+
+
+def _query(value, dim=4):
+    return np.full(dim, value, dtype=np.float32)
+
+
+def test_batcher_coalesces_concurrent_searches():
+    async def run():
+        rag = _RecordingRAG()
+        batcher = api.SearchBatcher(rag, window=0.05)
+        results = await asyncio.gather(*[
+            batcher.search(_query(i), k) for i, k in enumerate([1, 3, 2])
+        ])
+        await batcher.close()
+        return rag, results
+    
+    rag, results = asyncio.run(run())
+    assert rag.calls == [((3, 4), 3)]
+    assert results == [
+        [{"id": "0-0"}],
+        [{"id": "1-0"}, {"id": "1-1"}, {"id": "1-2"}],
+        [{"id": "2-0"}, {"id": "2-1"}]
+    ]
+
+
+def test_batcher_fails_only_the_mismatched_group():
+    async def run():
+        rag = _RecordingRAG()
+        batcher = api.SearchBatcher(rag, window=0.05)
+        results = await asyncio.gather(
+            batcher.search(_query(1), 1),
+            batcher.search(_query(2, dim=8), 1),
+            batcher.search(_query(3), 1),
+            return_exceptions=True
+        )
+        # The worker survives and serves later queries
+        later = await batcher.search(_query(4), 1)
+        await batcher.close()
+        return rag, results, later
+    
+    rag, results, later = asyncio.run(run())
+    assert sorted(rag.calls[:2]) == [((1, 8), 1), ((2, 4), 1)]
+    assert results[0] == [{"id": "1-0"}]
+    assert isinstance(results[1], ValueError)
+    assert results[2] == [{"id": "3-0"}]
+    assert later == [{"id": "4-0"}]
+
+
+def test_batcher_propagates_search_errors():
+    async def run():
+        batcher = api.SearchBatcher(_RecordingRAG(fail=True), window=0.05)
+        results = await asyncio.gather(
+            batcher.search(_query(1), 1),
+            batcher.search(_query(2), 2),
+            return_exceptions=True
+        )
+        with pytest.raises(ValueError):
+            await batcher.search(_query(3), 0)
+        await batcher.close()
+        return results
+    
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_batcher_close_cancels_worker():
+    async def run():
+        batcher = api.SearchBatcher(_RecordingRAG())
+        await batcher.search(_query(1), 1)
+        task = batcher._task
+        await batcher.close()
+        return task
+    
+    assert asyncio.run(run()).cancelled()
+
+
+def test_upload_batch_embeds_and_dedupes(client):
+    t = np.linspace(0, 10, 200)
+    sine = _csv(np.sin(t))
+    existing = client.post("/upload", content=sine).json()["document_id"]
+    
+    files = [
+        ("files", ("sine.csv", sine, "text/csv")),
+        ("files", ("cos.csv", _csv(np.cos(t)), "text/csv")),
+        ("files", ("short.csv", _csv(np.sin(t[:50])), "text/csv")),
+        ("files", ("cos_again.csv", _csv(np.cos(t)), "text/csv"))
+    ]
+    response = client.post(
+        "/upload_batch", files=files, params={"metadata": '{"group": {"id": 1}}'}
+    )
+    assert response.status_code == 200
+    ids = response.json()["document_ids"]
+    
+    # Metadata is part of the dedupe key, so the sine is stored again
+    assert ids[0] != existing
+    assert ids[1] == ids[3]
+    assert len(set(ids)) == 3
+    assert len(api.rag_system) == 4
+    
+    docs = [api.rag_system.get_document_by_id(doc_id) for doc_id in ids[:3]]
+    assert docs[2].data.shape == (50, 1)
+    assert docs[0].metadata == {"group": {"id": 1}}
+    assert docs[0].metadata is not docs[1].metadata
+    
+    # Re-uploading is a no-op that returns the same IDs
+    again = client.post(
+        "/upload_batch", files=files, params={"metadata": '{"group": {"id": 1}}'}
+    )
+    assert again.json()["document_ids"] == ids
+    assert len(api.rag_system) == 4
+
+
+def test_upload_batch_rejects_mismatched_file_atomically(client):
+    t = np.linspace(0, 10, 200)
+    files = [
+        ("files", ("sine.csv", _csv(np.sin(t)), "text/csv")),
+        ("files", ("wide.csv", _csv(np.stack([t, t], axis=1), "a,b"), "text/csv"))
+    ]
+    response = client.post("/upload_batch", files=files)
+    assert response.status_code == 400
+    assert "wide.csv" in response.json()["detail"]
+    assert len(api.rag_system) == 0
+    assert api.uploaded_documents == {}
+
+
+def test_upload_dedupes_reuploads(client):
+    content = _csv(np.sin(np.linspace(0, 10, 100)))
+    first = client.post("/upload", content=content).json()["document_id"]
+    assert client.post("/upload", content=content).json()["document_id"] == first
+    with_metadata = client.post(
+        "/upload", content=content, params={"metadata": '{"a": 1}'}
+    ).json()["document_id"]
+    assert with_metadata != first
+    assert len(api.rag_system) == 2
+
+
+def _npy(array):
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("array", [
+    np.sin(np.linspace(0, 10, 100)),
+    np.stack([np.sin(np.linspace(0, 10, 100))] * 2, axis=1)
+])
+@pytest.mark.parametrize("content_type", [
+    None, "application/x-npy", "application/octet-stream", "text/csv"
+])
+def test_upload_detects_npy_by_magic_string(client, monkeypatch, array, content_type):
+    # Each column adds 260 embedding dimensions
+    _use_store(monkeypatch, TimeSeriesRAG(embedding_dim=260 * array.ndim))
+    headers = {"Content-Type": content_type} if content_type else {}
+    response = client.post("/upload", content=_npy(array), headers=headers)
+    assert response.status_code == 200
+    
+    doc = api.rag_system.get_document_by_id(response.json()["document_id"])
+    assert doc.data.dtype == np.float32
+    np.testing.assert_allclose(doc.data, array.reshape(len(array), -1), rtol=1e-6)
+
+
+@pytest.mark.parametrize("content_type", [None, "application/octet-stream"])
+def test_upload_parses_csv_regardless_of_content_type(client, content_type):
+    headers = {"Content-Type": content_type} if content_type else {}
+    values = np.sin(np.linspace(0, 10, 100))
+    response = client.post("/upload", content=_csv(values), headers=headers)
+    assert response.status_code == 200
+    
+    doc = api.rag_system.get_document_by_id(response.json()["document_id"])
+    assert doc.data.shape == (100, 1)
+
+
+def test_upload_rejects_3d_npy(client):
+    response = client.post("/upload", content=_npy(np.zeros((3, 4, 5))))
+    assert response.status_code == 400
+    assert "3D" in response.json()["detail"]
+
+
+def test_upload_batch_mixes_npy_and_csv(client):
+    t = np.linspace(0, 10, 100)
+    files = [
+        ("files", ("a.npy", _npy(np.sin(t)), "application/octet-stream")),
+        ("files", ("b.csv", _csv(np.cos(t)), "application/octet-stream"))
+    ]
+    response = client.post("/upload_batch", files=files)
+    assert response.status_code == 200
+    
+    ids = response.json()["document_ids"]
+    np.testing.assert_allclose(
+        api.rag_system.get_document_by_id(ids[0]).data[:, 0], np.sin(t), rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        api.rag_system.get_document_by_id(ids[1]).data[:, 0], np.cos(t), rtol=1e-6
+    )
@@ -0,0 +1,55 @@
+"""Tests for the query result cache."""
+
+import numpy as np
+import pytest
+
+from timeseries_rag.cache import QueryCache
+from timeseries_rag.models import TimeSeriesEmbedder
+
+
+@pytest.fixture
+def embedder():
+    return TimeSeriesEmbedder()
+
+
+def test_exact_hit_and_eviction():
+    cache = QueryCache(max_size=2)
+    embedding = np.ones(4, dtype=np.float32)
+    for key in ("a", "b", "c"):
+        cache.put(key, embedding, 5, [{"id": key}])
+    assert cache.get("a") is None
+    assert cache.get("c") == [{"id": "c"}]
+    assert cache.exact_hits == 1
+
+
+def test_semantic_hit_requires_same_k(embedder):
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 10, 500)
+    cache = QueryCache()
+    cache.put("sine", embedder.embed(np.sin(t)), 5, [{"id": "sine"}])
+    
+    near_duplicate = embedder.embed(np.sin(t) + 0.05 * rng.normal(size=len(t)))
+    assert cache.get_similar(near_duplicate, 3) is None
+    assert cache.get_similar(near_duplicate, 5) == [{"id": "sine"}]
+
+
+def test_semantic_tier_ignores_shared_offset(embedder):
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 10, 500)
+    cache = QueryCache()
+    cache.put("noise", embedder.embed(100.0 + rng.normal(size=len(t))), 5, [])
+    
+    assert cache.get_similar(embedder.embed(100.0 + np.sin(t)), 5) is None
+    assert cache.semantic_hits == 0
+
+
+def test_dimension_mismatch_is_a_miss():
+    cache = QueryCache()
+    cache.put("a", np.ones(4, dtype=np.float32), 5, [{"id": "a"}])
+    wide = np.ones(8, dtype=np.float32)
+    assert cache.get_similar(wide, 5) is None
+    assert cache.misses == 1
+    
+    cache.put("b", wide, 5, [{"id": "b"}])
+    assert cache.get("b") == [{"id": "b"}]
+    assert cache.get_similar(np.ones(4, dtype=np.float32), 5) == [{"id": "a"}]
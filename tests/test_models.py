@@ -0,0 +1,84 @@
+"""Tests for the time series embedder."""
+
+import numpy as np
+import pytest
+
+from timeseries_rag import numba_utils
+from timeseries_rag.models import TimeSeriesEmbedder
+from timeseries_rag.rag import TimeSeriesDocument, TimeSeriesRAG
+
+
+@pytest.fixture
+def embedder():
+    return TimeSeriesEmbedder()
+
+
+def test_embed_is_offset_and_scale_invariant(embedder):
+    t = np.linspace(0, 10, 500)
+    np.testing.assert_allclose(
+        embedder.embed(np.sin(t)),
+        embedder.embed(100.0 + 5.0 * np.sin(t)),
+        atol=1e-5
+    )
+
+
+def test_embed_matches_numpy_fallback(embedder, monkeypatch):
+    x = np.random.default_rng(0).normal(size=(1000, 2)) * 5 + 3
+    fused = embedder.embed(x)
+    monkeypatch.setattr(numba_utils, "NUMBA_AVAILABLE", False)
+    np.testing.assert_allclose(embedder.embed(x), fused, atol=1e-5)
+
+
+def test_embed_batch_matches_embed(embedder):
+    batch = np.random.default_rng(0).normal(size=(4, 300)) * 10 + 50
+    batch[1] = 7.0
+    expected = np.stack([embedder.embed(series) for series in batch])
+    np.testing.assert_allclose(embedder.embed_batch(batch), expected, atol=1e-5)
+
+
+def test_retrieval_ignores_offset(embedder):
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 10, 500)
+    rag = TimeSeriesRAG()
+    for doc_id, series in [
+        ("sine", np.sin(t)),
+        ("noise", 100.0 + rng.normal(size=len(t))),
+        ("square", 100.0 + np.sign(np.sin(3 * t)))
+    ]:
+        rag.add_document(TimeSeriesDocument(
+            id=doc_id,
+            data=series,
+            metadata={},
+            embedding=embedder.embed(series)
+        ))
+    
+    results = rag.search(embedder.embed(100.0 + np.sin(t)), k=3)
+    assert results[0]["id"] == "sine"
+    assert results[0]["distance"] < 1e-3
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+@pytest.mark.parametrize("bad_value", [np.nan, np.inf, -np.inf])
+def test_embed_rejects_non_finite_values(embedder, monkeypatch, use_numba, bad_value):
+    monkeypatch.setattr(numba_utils, "NUMBA_AVAILABLE", use_numba)
+    x = np.sin(np.linspace(0, 10, 100))
+    x[10] = bad_value
+    with pytest.raises(ValueError, match="NaN or infinite"):
+        embedder.embed(x)
+
+
+def test_embed_batch_rejects_non_finite_values(embedder):
+    batch = np.zeros((3, 50))
+    batch[2, 7] = np.nan
+    with pytest.raises(ValueError, match="NaN or infinite"):
+        embedder.embed_batch(batch)
+
+
+def test_scratch_buffer_is_capped(embedder):
+    from timeseries_rag.models import _SCRATCH_MAX_SIZE
+    
+    x = np.sin(np.linspace(0, 100, 4000))
+    expected = embedder.embed(x)
+    embedder.embed(np.zeros(_SCRATCH_MAX_SIZE + 1))
+    assert len(embedder._local.buffer) <= _SCRATCH_MAX_SIZE
+    np.testing.assert_array_equal(embedder.embed(x), expected)
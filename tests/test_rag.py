@@ -0,0 +1,79 @@
+"""Tests for the RAG document store."""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from timeseries_rag.rag import TimeSeriesDocument, TimeSeriesRAG
+
+
+def _documents(n, dim=8, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        TimeSeriesDocument(
+            id=str(i),
+            data=np.arange(i + 1, dtype=np.float32),
+            metadata={"i": i},
+            embedding=rng.normal(size=dim).astype(np.float32)
+        )
+        for i in range(n)
+    ]
+
+
+def test_search_finds_stored_document():
+    docs = _documents(20)
+    rag = TimeSeriesRAG(embedding_dim=8)
+    rag.add_documents(docs)
+    result = rag.search(docs[7].embedding, k=1)[0]
+    assert result["id"] == "7"
+    assert result["metadata"] == {"i": 7}
+
+
+def test_save_and_reload(tmp_path):
+    docs = _documents(20)
+    rag = TimeSeriesRAG(embedding_dim=8, persist_dir=str(tmp_path))
+    rag.add_documents(docs)
+    rag.save()
+    rag.close()
+    
+    reloaded = TimeSeriesRAG(embedding_dim=8, persist_dir=str(tmp_path))
+    assert len(reloaded) == 20
+    np.testing.assert_array_equal(reloaded.get_document_by_id("5").data, docs[5].data)
+    assert reloaded.search(docs[3].embedding, k=1)[0]["id"] == "3"
+    reloaded.close()
+
+
+def test_persist_dir_is_exclusive_across_processes(tmp_path):
+    rag = TimeSeriesRAG(embedding_dim=8, persist_dir=str(tmp_path))
+    code = (
+        "import sys\n"
+        "from timeseries_rag.rag import TimeSeriesRAG\n"
+        "try:\n"
+        "    TimeSeriesRAG(embedding_dim=8, persist_dir=sys.argv[1])\n"
+        "except RuntimeError:\n"
+        "    sys.exit(3)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    other = subprocess.run([sys.executable, "-c", code, str(tmp_path)], env=env)
+    assert other.returncode == 3
+    
+    rag.close()
+    other = subprocess.run([sys.executable, "-c", code, str(tmp_path)], env=env)
+    assert other.returncode == 0
+
+
+def test_load_rejects_incomplete_store(tmp_path):
+    rag = TimeSeriesRAG(embedding_dim=8, persist_dir=str(tmp_path))
+    rag.add_documents(_documents(5))
+    rag.save()
+    rag.close()
+    os.remove(tmp_path / TimeSeriesRAG._DOCUMENTS_FILE)
+    
+    with pytest.raises(FileNotFoundError, match="documents.pkl"):
+        TimeSeriesRAG(embedding_dim=8, persist_dir=str(tmp_path))
+    # A failed load releases the lock, so the error is the same next time
+    with pytest.raises(FileNotFoundError):
+        TimeSeriesRAG(embedding_dim=8, persist_dir=str(tmp_path))